@@ -5,6 +5,7 @@ This module provides centralized configuration management using environment vari
 with sensible defaults for development and production deployment.
 """
 
+from collections.abc import Mapping
 import os
 import tempfile
 from dataclasses import dataclass
@@ -15,20 +16,28 @@ from pathlib import Path
 DEFAULT_CACHE_DIR = str(Path(tempfile.gettempdir()) / "lucidity-mcp-repos")
 DEFAULT_CLONE_TIMEOUT_SECONDS = 300
 DEFAULT_FETCH_TIMEOUT_SECONDS = 60
+DEFAULT_FETCH_TTL_SECONDS = 60
 DEFAULT_CLEANUP_DAYS = 7
 DEFAULT_MCP_PORT = 6969
 MIN_CODE_CHANGE_BYTES = 10
 DEFAULT_CORS_ORIGINS = "*"
 
+# Values accepted as "true" for boolean environment variables
+_TRUTHY = frozenset(("true", "1", "yes"))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Config:
-    """Configuration settings for Lucidity MCP server."""
+    """Configuration settings for Lucidity MCP server.
+
+    Instances are immutable so a single one can be shared safely across threads.
+    """
 
     # Repository caching configuration
     cache_dir: str
     clone_timeout: int
     fetch_timeout: int
+    fetch_ttl: int
     cleanup_days: int
 
     # Server configuration
@@ -48,51 +57,50 @@ class Config:
         Raises:
             ValueError: If environment variables contain invalid values
         """
+        env = os.environ
+
         # Parse CORS origins - can be comma-separated list or "*"
-        cors_origins_str = os.environ.get("LUCIDITY_CORS_ORIGINS", DEFAULT_CORS_ORIGINS)
+        cors_origins_str = env.get("LUCIDITY_CORS_ORIGINS", DEFAULT_CORS_ORIGINS)
         if cors_origins_str == "*":
             cors_origins = ["*"]
         else:
             cors_origins = [origin.strip() for origin in cors_origins_str.split(",") if origin.strip()]
 
-        # Parse integer values with error handling
-        try:
-            clone_timeout = int(os.environ.get("LUCIDITY_CLONE_TIMEOUT", str(DEFAULT_CLONE_TIMEOUT_SECONDS)))
-        except ValueError as e:
-            raise ValueError(
-                f"Invalid value for LUCIDITY_CLONE_TIMEOUT: {os.environ.get('LUCIDITY_CLONE_TIMEOUT')}"
-            ) from e
-
-        try:
-            fetch_timeout = int(os.environ.get("LUCIDITY_FETCH_TIMEOUT", str(DEFAULT_FETCH_TIMEOUT_SECONDS)))
-        except ValueError as e:
-            raise ValueError(
-                f"Invalid value for LUCIDITY_FETCH_TIMEOUT: {os.environ.get('LUCIDITY_FETCH_TIMEOUT')}"
-            ) from e
-
-        try:
-            cleanup_days = int(os.environ.get("LUCIDITY_CLEANUP_DAYS", str(DEFAULT_CLEANUP_DAYS)))
-        except ValueError as e:
-            raise ValueError(
-                f"Invalid value for LUCIDITY_CLEANUP_DAYS: {os.environ.get('LUCIDITY_CLEANUP_DAYS')}"
-            ) from e
-
-        try:
-            mcp_port = int(os.environ.get("LUCIDITY_MCP_PORT", str(DEFAULT_MCP_PORT)))
-        except ValueError as e:
-            raise ValueError(f"Invalid value for LUCIDITY_MCP_PORT: {os.environ.get('LUCIDITY_MCP_PORT')}") from e
-
         return cls(
-            cache_dir=os.environ.get("LUCIDITY_CACHE_DIR", DEFAULT_CACHE_DIR),
-            clone_timeout=clone_timeout,
-            fetch_timeout=fetch_timeout,
-            cleanup_days=cleanup_days,
-            mcp_port=mcp_port,
+            cache_dir=env.get("LUCIDITY_CACHE_DIR", DEFAULT_CACHE_DIR),
+            clone_timeout=_parse_int(env, "LUCIDITY_CLONE_TIMEOUT", DEFAULT_CLONE_TIMEOUT_SECONDS),
+            fetch_timeout=_parse_int(env, "LUCIDITY_FETCH_TIMEOUT", DEFAULT_FETCH_TIMEOUT_SECONDS),
+            fetch_ttl=_parse_int(env, "LUCIDITY_FETCH_TTL", DEFAULT_FETCH_TTL_SECONDS),
+            cleanup_days=_parse_int(env, "LUCIDITY_CLEANUP_DAYS", DEFAULT_CLEANUP_DAYS),
+            mcp_port=_parse_int(env, "LUCIDITY_MCP_PORT", DEFAULT_MCP_PORT),
             cors_origins=cors_origins,
-            ssh_verify=os.environ.get("LUCIDITY_SSH_VERIFY", "false").lower() in ("true", "1", "yes"),
+            ssh_verify=env.get("LUCIDITY_SSH_VERIFY", "false").lower() in _TRUTHY,
         )
 
 
+def _parse_int(env: Mapping[str, str], key: str, default: int) -> int:
+    """Parse an integer environment variable, reading it only once.
+
+    Args:
+        env: Environment mapping to read from
+        key: Name of the environment variable
+        default: Value to use when the variable is not set
+
+    Returns:
+        The parsed integer value
+
+    Raises:
+        ValueError: If the variable is set but is not a valid integer
+    """
+    raw = env.get(key)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError as e:
+        raise ValueError(f"Invalid value for {key}: {raw}") from e
+
+
 # Global configuration instance
 _config: Config | None = None
 
@@ -103,7 +111,22 @@ def get_config() -> Config:
     Returns:
         Global Config instance, created from environment on first call
     """
+    config = _config
+    if config is None:
+        config = _load_config()
+    return config
+
+
+def _load_config() -> Config:
+    """Build the global configuration instance from the environment.
+
+    Kept out of ``get_config`` so the common path is a single global load
+    and identity check. Concurrent first calls may each build a Config, but
+    they are equivalent and the last assignment wins.
+
+    Returns:
+        The newly created global Config instance
+    """
     global _config
-    if _config is None:
-        _config = Config.from_environment()
+    _config = Config.from_environment()
     return _config
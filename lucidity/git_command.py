@@ -5,10 +5,13 @@ This module provides reusable functions for executing git commands with
 standard error handling, timeouts, and security considerations.
 """
 
+import asyncio
+from functools import cached_property, lru_cache
 import os
+import shutil
 import subprocess
 
-from .config import get_config
+from .config import Config, get_config
 from .log import logger
 from .validation import sanitize_git_command_args
 
@@ -45,32 +48,121 @@ class GitTimeoutError(Exception):
         super().__init__(f"Git command timed out after {timeout}s: {' '.join(command)}")
 
 
-def run_git_command(
+class GitCommandResult:
+    """Result of a git command whose output is decoded only when accessed.
+
+    Provides the same ``args``/``returncode``/``stdout``/``stderr`` attributes as
+    subprocess.CompletedProcess, so commands that only need the exit status (e.g.
+    ``git fetch``) never pay for decoding their output.
+    """
+
+    def __init__(self, args: list[str], returncode: int, stdout: bytes, stderr: bytes) -> None:
+        """Initialize GitCommandResult.
+
+        Args:
+            args: The git command that was run
+            returncode: Command return code
+            stdout: Raw standard output
+            stderr: Raw standard error output
+        """
+        self.args = args
+        self.returncode = returncode
+        self.stdout_bytes = stdout
+        self.stderr_bytes = stderr
+
+    @cached_property
+    def stdout(self) -> str:
+        """Standard output decoded as UTF-8."""
+        return self.stdout_bytes.decode("utf-8", errors="replace")
+
+    @cached_property
+    def stderr(self) -> str:
+        """Standard error output decoded as UTF-8."""
+        return self.stderr_bytes.decode("utf-8", errors="replace")
+
+
+# Absolute path to the git binary, resolved once so each call skips the PATH search
+_GIT_BIN = shutil.which("git") or "git"
+
+def _get_git_env(config: Config) -> dict[str, str]:
+    """Build the environment for a git subprocess.
+
+    The process environment is copied on every call, so variables set after
+    startup (e.g. ``SSH_AUTH_SOCK``) reach git.
+
+    Args:
+        config: Active configuration (controls SSH host key verification)
+
+    Returns:
+        Environment mapping to pass to the git subprocess
+    """
+    env = os.environ.copy()
+
+    # Read-only commands like diff/status skip taking the optional index lock,
+    # and git never blocks waiting for credentials on a terminal nobody is at
+    env.setdefault("GIT_OPTIONAL_LOCKS", "0")
+    env.setdefault("GIT_TERMINAL_PROMPT", "0")
+
+    # Configure SSH behavior based on settings
+    if not config.ssh_verify:
+        env["GIT_SSH_COMMAND"] = "ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null"
+        logger.debug("SSH host key verification disabled")
+
+    return env
+
+
+@lru_cache(maxsize=512)
+def _sanitize_cached(args: tuple[str, ...]) -> tuple[str, ...]:
+    """Memoized sanitization for hashable argument tuples.
+
+    Args:
+        args: Git command arguments as a tuple
+
+    Returns:
+        Sanitized arguments as a tuple
+
+    Raises:
+        ValueError: If any argument is potentially dangerous
+    """
+    return tuple(sanitize_git_command_args(list(args)))
+
+
+def _sanitize_args(args: list[str]) -> tuple[str, ...]:
+    """Sanitize git arguments, reusing cached results for repeated argument lists.
+
+    Args:
+        args: Git command arguments
+
+    Returns:
+        Sanitized arguments as a tuple
+
+    Raises:
+        ValueError: If any argument is potentially dangerous
+    """
+    try:
+        return _sanitize_cached(tuple(args))
+    except TypeError:
+        # Unhashable arguments cannot be memoized; validate them directly
+        return tuple(sanitize_git_command_args(args))
+
+
+def _prepare_git_command(
     args: list[str],
-    cwd: str,
-    timeout: int | None = None,
-    check: bool = True,
-    env_overrides: dict[str, str] | None = None,
-) -> subprocess.CompletedProcess[str]:
-    """Run a git command with standard error handling and logging.
+    timeout: int | None,
+    env_overrides: dict[str, str] | None,
+) -> tuple[list[str], dict[str, str], int]:
+    """Validate arguments and resolve the command line, environment and timeout.
 
     Args:
         args: Git command arguments (without 'git' prefix)
-        cwd: Working directory for the command
         timeout: Timeout in seconds (uses config default if None)
-        check: Whether to raise on non-zero exit code
         env_overrides: Optional environment variable overrides
 
     Returns:
-        CompletedProcess instance with command results
+        Tuple of (command, environment, timeout)
 
     Raises:
-        GitCommandError: If command fails and check=True
-        GitTimeoutError: If command times out
-
-    Examples:
-        >>> result = run_git_command(["status"], "/path/to/repo")
-        >>> result = run_git_command(["diff", "HEAD~1..HEAD"], "/path/to/repo")
+        ValueError: If any argument is potentially dangerous
     """
     config = get_config()
 
@@ -80,34 +172,60 @@ def run_git_command(
 
     # Sanitize arguments
     try:
-        sanitized_args = sanitize_git_command_args(args)
+        sanitized_args = _sanitize_args(args)
     except ValueError as e:
         logger.error("Invalid git command arguments: %s", e)
         raise
 
     # Set up environment
-    env = os.environ.copy()
+    env = _get_git_env(config)
     if env_overrides:
         env.update(env_overrides)
 
-    # Configure SSH behavior based on settings
-    if not config.ssh_verify:
-        env["GIT_SSH_COMMAND"] = "ssh -o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null"
-        logger.debug("SSH host key verification disabled")
+    return ["git", *sanitized_args], env, timeout
+
+
+def run_git_command(
+    args: list[str],
+    cwd: str,
+    timeout: int | None = None,
+    check: bool = True,
+    env_overrides: dict[str, str] | None = None,
+) -> GitCommandResult:
+    """Run a git command with standard error handling and logging.
 
-    command = ["git"] + sanitized_args
+    Args:
+        args: Git command arguments (without 'git' prefix)
+        cwd: Working directory for the command
+        timeout: Timeout in seconds (uses config default if None)
+        check: Whether to raise on non-zero exit code
+        env_overrides: Optional environment variable overrides
+
+    Returns:
+        GitCommandResult with the command's exit status and output
+
+    Raises:
+        GitCommandError: If command fails and check=True
+        GitTimeoutError: If command times out
+
+    Examples:
+        >>> result = run_git_command(["status"], "/path/to/repo")
+        >>> result = run_git_command(["diff", "HEAD~1..HEAD"], "/path/to/repo")
+    """
+    command, env, timeout = _prepare_git_command(args, timeout, env_overrides)
     logger.debug("Running git command: %s (cwd=%s, timeout=%s)", command, cwd, timeout)
 
     try:
-        result = subprocess.run(
+        completed = subprocess.run(
             command,
             cwd=cwd,
             capture_output=True,
-            text=True,
             check=False,  # We'll handle errors ourselves
             timeout=timeout,
             env=env,
+            executable=_GIT_BIN,
         )
+        result = GitCommandResult(command, completed.returncode, completed.stdout, completed.stderr)
 
         if result.returncode != 0 and check:
             logger.error("Git command failed: %s (stderr: %s)", command, result.stderr)
@@ -122,3 +240,66 @@ def run_git_command(
     except Exception as e:
         logger.error("Unexpected error running git command %s: %s", command, e)
         raise
+
+
+async def run_git_command_async(
+    args: list[str],
+    cwd: str,
+    timeout: int | None = None,  # noqa: ASYNC109 - mirrors run_git_command, enforced with asyncio.wait_for
+    check: bool = True,
+    env_overrides: dict[str, str] | None = None,
+) -> GitCommandResult:
+    """Run a git command without blocking the event loop.
+
+    Behaves like run_git_command but uses asyncio.create_subprocess_exec, so it
+    can be awaited from async MCP handlers and several commands can run concurrently.
+
+    Args:
+        args: Git command arguments (without 'git' prefix)
+        cwd: Working directory for the command
+        timeout: Timeout in seconds (uses config default if None)
+        check: Whether to raise on non-zero exit code
+        env_overrides: Optional environment variable overrides
+
+    Returns:
+        GitCommandResult with the command's exit status and output
+
+    Raises:
+        GitCommandError: If command fails and check=True
+        GitTimeoutError: If command times out
+
+    Examples:
+        >>> result = await run_git_command_async(["diff", "HEAD~1..HEAD"], "/path/to/repo")
+    """
+    command, env, timeout = _prepare_git_command(args, timeout, env_overrides)
+    logger.debug("Running async git command: %s (cwd=%s, timeout=%s)", command, cwd, timeout)
+
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        cwd=cwd,
+        env=env,
+        executable=_GIT_BIN,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except BaseException as e:
+        # Reap git whether it timed out or the awaiting task was cancelled
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        if isinstance(e, TimeoutError):
+            logger.error("Git command timed out after %ds: %s", timeout, command)
+            raise GitTimeoutError(command, timeout) from e
+        raise
+
+    returncode = proc.returncode if proc.returncode is not None else -1
+    result = GitCommandResult(command, returncode, stdout, stderr)
+
+    if result.returncode != 0 and check:
+        logger.error("Git command failed: %s (stderr: %s)", command, result.stderr)
+        raise GitCommandError(command, result.stderr, result.returncode)
+
+    logger.debug("Git command succeeded: %s", command)
+    return result
@@ -6,8 +6,6 @@ import traceback
 from types import TracebackType
 from typing import Any
 
-from rich.logging import RichHandler
-
 logger = logging.getLogger("lucidity")
 
 
@@ -34,6 +32,8 @@ def setup_logging(
     # Add console handler if enabled (normal console mode with rich output)
     if console_enabled and not stderr_only:
         if handler is None:
+            from rich.logging import RichHandler
+
             handler = RichHandler(rich_tracebacks=True, markup=True)
         handlers.append(handler)
 
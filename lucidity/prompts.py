@@ -154,14 +154,12 @@ def format_dimensions(selected_dimensions: list[str] | None = None) -> str:
     Returns:
         Formatted dimensions string for the prompt
     """
-    dimensions = selected_dimensions or list(QUALITY_DIMENSIONS.keys())
-    formatted = ""
+    dimensions = selected_dimensions or QUALITY_DIMENSIONS
+    return "".join(QUALITY_DIMENSIONS[dim] + "\n" for dim in dimensions if dim in QUALITY_DIMENSIONS)
 
-    for dim in dimensions:
-        if dim in QUALITY_DIMENSIONS:
-            formatted += QUALITY_DIMENSIONS[dim] + "\n"
 
-    return formatted
+# Every prompt lists all dimensions, so format them once at import time
+_ALL_DIMENSIONS_TEXT = format_dimensions()
 
 
 def generate_analysis_prompt(code: str, language: str, original_code: str | None = None) -> str:
@@ -178,9 +176,6 @@ def generate_analysis_prompt(code: str, language: str, original_code: str | None
     Returns:
         Complete analysis prompt for the MCP
     """
-    # Format the dimensions section with all dimensions
-    dimensions_text = format_dimensions(None)
-
     # Generate diff section if original code is provided
     diff_section = ""
     if original_code:
@@ -197,7 +192,7 @@ Identify any regressions, unintended modifications, or improvements in the git d
 
     # Build the complete prompt
     return BASE_ANALYSIS_PROMPT.format(
-        language=language, code=code, diff_section=diff_section, dimensions=dimensions_text
+        language=language, code=code, diff_section=diff_section, dimensions=_ALL_DIMENSIONS_TEXT
     )
 
 
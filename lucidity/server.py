@@ -7,27 +7,13 @@ which handles MCP protocol communication using decorators for resources and tool
 import argparse
 import asyncio
 import contextlib
+from functools import lru_cache
 import ipaddress
 from pathlib import Path
 import sys
-from typing import Any, cast
-
-import anyio
-from dotenv import load_dotenv
-from mcp.server.sse import SseServerTransport
-from mcp.server.stdio import stdio_server
-from rich.logging import RichHandler
-from starlette.applications import Starlette
-from starlette.middleware import Middleware
-from starlette.middleware.cors import CORSMiddleware
-from starlette.requests import Request
-from starlette.routing import Mount, Route
-import uvicorn
-
-# Import resources and tools modules to register decorators
-from . import prompts, tools  # noqa: F401
+from typing import TYPE_CHECKING, Any
+
 from .config import get_config
-from .context import mcp
 from .log import (
     handle_taskgroup_exception,
     logger,
@@ -36,6 +22,12 @@ from .log import (
     setup_logging,
 )
 
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+    from rich.logging import RichHandler
+    from starlette.middleware import Middleware
+    import uvicorn
+
 
 def check_dependencies() -> bool:
     """Check if required dependencies are available.
@@ -51,6 +43,48 @@ def check_dependencies() -> bool:
         return False
 
 
+@lru_cache(maxsize=1)
+def _make_handler() -> "RichHandler":
+    """Create the Rich console log handler, once per process.
+
+    Returns:
+        Shared RichHandler instance
+    """
+    from rich.logging import RichHandler
+
+    return RichHandler(rich_tracebacks=True, markup=True)
+
+
+def _register_mcp_decorators() -> "FastMCP":
+    """Import the modules that register MCP prompts and tools.
+
+    Deferred until a transport actually starts so that non-server paths such as
+    ``--cleanup-cache`` don't pay for importing the MCP SDK.
+
+    Returns:
+        The shared FastMCP instance with all prompts and tools registered
+    """
+    # Import resources and tools modules to register decorators
+    from . import prompts  # noqa: F401
+    from .context import mcp
+    from .tools import code_analysis  # noqa: F401
+
+    return mcp
+
+
+def _is_nonetype_shutdown_error(error: TypeError) -> bool:
+    """Check whether a TypeError is the expected "'NoneType' object is not callable" shutdown error.
+
+    Args:
+        error: The TypeError to inspect
+
+    Returns:
+        True if the error is the expected shutdown error, False otherwise
+    """
+    message = error.args[0] if error.args else ""
+    return isinstance(message, str) and message.startswith("'NoneType'") and message.endswith("not callable")
+
+
 # Define middleware to suppress 'NoneType object is not callable' errors during shutdown
 class SuppressNoneTypeErrorMiddleware:
     """Middleware to suppress expected shutdown TypeErrors."""
@@ -74,26 +108,106 @@ class SuppressNoneTypeErrorMiddleware:
         try:
             await self.app(scope, receive, send)
         except TypeError as e:
-            if "NoneType" in str(e) and "not callable" in str(e):
+            if _is_nonetype_shutdown_error(e):
                 logger.debug("Suppressing expected shutdown TypeError: %s", e)
             else:
                 raise
 
 
-def load_environment() -> None:
-    """Load environment variables from .env file."""
+def _cors_middleware(allow_origins: list[str], allow_methods: list[str]) -> "Middleware":
+    """Build the CORS middleware shared by the network transports.
+
+    Args:
+        allow_origins: Allowed origins, or ["*"] to allow any origin
+        allow_methods: HTTP methods the transport's endpoints accept
+
+    Returns:
+        Starlette CORSMiddleware wrapped for a Starlette middleware list
+    """
+    from starlette.middleware import Middleware
+    from starlette.middleware.cors import CORSMiddleware
+
+    # allow_headers=["*"] makes preflight responses echo the requested headers,
+    # which also covers Authorization (a literal "*" would not)
+    return Middleware(
+        CORSMiddleware,
+        allow_origins=allow_origins,
+        allow_methods=allow_methods,
+        allow_headers=["*"],
+    )
+
+
+def load_environment() -> Path | None:
+    """Load environment variables from .env file.
+
+    Variables already present in the environment are not overridden.
+
+    Returns:
+        Path of the loaded .env file, or None if no file was found
+    """
+    from dotenv import load_dotenv
+
     # Look for .env in current directory and parent directories
     env_path = Path(".env")
     if not env_path.exists():
         # Try in the same directory as the script
         script_dir = Path(__file__).parent.parent
         env_path = script_dir / ".env"
+        if not env_path.exists():
+            logger.debug("No .env file found, using system environment variables")
+            return None
 
-    if env_path.exists():
-        logger.debug("Loading environment from %s", env_path)
-        load_dotenv(env_path)
-    else:
-        logger.debug("No .env file found, using system environment variables")
+    logger.debug("Loading environment from %s", env_path)
+    load_dotenv(env_path)
+    return env_path
+
+
+def _make_uvicorn_server(app: Any, host: str, port: int) -> "uvicorn.Server":
+    """Build the Uvicorn server used by all network transports.
+
+    Args:
+        app: The ASGI application to serve
+        host: Host to bind to
+        port: Port to listen on
+
+    Returns:
+        Configured Uvicorn server, ready to run
+    """
+    import uvicorn
+
+    # loop/http stay on "auto": Uvicorn uses uvloop and httptools when the
+    # "speedups" extra is installed and falls back to asyncio/h11 otherwise
+    uvicorn_config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        log_config=None,
+        timeout_graceful_shutdown=0,  # Shutdown immediately
+    )
+    return uvicorn.Server(uvicorn_config)
+
+
+# Hosts FastMCP enables DNS-rebinding protection for by default
+_LOOPBACK_HOSTS = frozenset(("127.0.0.1", "localhost", "::1"))
+
+
+def _configure_mcp_settings(mcp: "FastMCP", host: str, port: int) -> None:
+    """Align FastMCP's settings with the address the server binds to.
+
+    FastMCP derives its Host header allow-list from the host it was created
+    with (127.0.0.1), so binding elsewhere would reject every non-loopback
+    Host with 421. Off loopback the protection is dropped, as FastMCP does for
+    any non-loopback host it is constructed with.
+
+    Args:
+        mcp: The FastMCP instance to configure
+        host: Host the server binds to
+        port: Port the server listens on
+    """
+    mcp.settings.host = host
+    mcp.settings.port = port
+    if host not in _LOOPBACK_HOSTS:
+        mcp.settings.transport_security = None
 
 
 def run_sse_server(config: dict[str, Any]) -> None:
@@ -102,6 +216,16 @@ def run_sse_server(config: dict[str, Any]) -> None:
     Args:
         config: Server configuration
     """
+    from mcp.server.sse import SseServerTransport
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.requests import Request
+    from starlette.routing import Mount, Route
+
+    host: str = config["host"]
+    port: int = config["port"]
+    debug: bool = config.get("debug", False)
+    mcp = _register_mcp_decorators()
     app_config = get_config()
 
     # Set up SSE transport
@@ -130,15 +254,10 @@ def run_sse_server(config: dict[str, Any]) -> None:
 
     # Create Starlette app with custom middleware including our suppressor and CORS
     app = Starlette(
-        debug=config.get("debug", False),
+        debug=debug,
         middleware=[
             Middleware(SuppressNoneTypeErrorMiddleware),
-            Middleware(
-                CORSMiddleware,
-                allow_origins=app_config.cors_origins,
-                allow_methods=["GET", "POST"],
-                allow_headers=["*"],
-            ),
+            _cors_middleware(app_config.cors_origins, ["GET", "POST"]),
         ],
         routes=[
             Route("/sse", endpoint=handle_sse),
@@ -146,22 +265,17 @@ def run_sse_server(config: dict[str, Any]) -> None:
         ],
     )
 
-    # Create a custom Uvicorn config with our shutdown handler
-    uvicorn_config = uvicorn.Config(
-        app,
-        host=cast(str, config["host"]),
-        port=cast(int, config["port"]),
-        log_config=None,
-        timeout_graceful_shutdown=0,  # Shutdown immediately
-    )
-    # Create server with the Config object
-    server = uvicorn.Server(uvicorn_config)
     # Actually run the server
-    server.run()
+    _make_uvicorn_server(app, host, port).run()
 
 
 def run_stdio_server() -> None:
     """Run the server with stdio transport."""
+    import anyio
+    from mcp.server.stdio import stdio_server
+
+    mcp = _register_mcp_decorators()
+
     # Use stdio transport for terminal use
     logger.debug("🔌 Using stdio transport for terminal interaction")
 
@@ -185,15 +299,16 @@ def run_streamable_http_server(config: dict[str, Any]) -> None:
     Args:
         config: Server configuration
     """
+    host: str = config["host"]
+    port: int = config["port"]
+    mcp = _register_mcp_decorators()
     logger.debug("🔌 Using Streamable HTTP transport for network communication")
 
-    # Use FastMCP's built-in run method with streamable-http transport
-    # This provides a single /mcp endpoint for all MCP communication
-    mcp.run(
-        transport="streamable-http",
-        host=cast(str, config["host"]),
-        port=cast(int, config["port"]),
-    )
+    _configure_mcp_settings(mcp, host, port)
+
+    # Use FastMCP's streamable HTTP app, which provides a single /mcp endpoint
+    # for all MCP communication, served with our shared Uvicorn settings
+    _make_uvicorn_server(mcp.streamable_http_app(), host, port).run()
 
 
 def run_combined_server(config: dict[str, Any]) -> None:
@@ -219,6 +334,17 @@ def run_combined_server(config: dict[str, Any]) -> None:
             "Install with: pip install 'mcp[cli]>=1.9.0' or pip install -e ."
         ) from e
     
+    import anyio
+    from mcp.server.sse import SseServerTransport
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.requests import Request
+    from starlette.routing import Mount, Route
+
+    host: str = config["host"]
+    port: int = config["port"]
+    debug: bool = config.get("debug", False)
+    mcp = _register_mcp_decorators()
     app_config = get_config()
     logger.debug("🔌 Using combined SSE + Streamable HTTP transports for network communication")
 
@@ -279,15 +405,10 @@ def run_combined_server(config: dict[str, Any]) -> None:
 
     # Create Starlette app with both SSE and Streamable HTTP endpoints
     app = Starlette(
-        debug=config.get("debug", False),
+        debug=debug,
         middleware=[
             Middleware(SuppressNoneTypeErrorMiddleware),
-            Middleware(
-                CORSMiddleware,
-                allow_origins=app_config.cors_origins,
-                allow_methods=["GET", "POST", "DELETE"],
-                allow_headers=["*"],
-            ),
+            _cors_middleware(app_config.cors_origins, ["GET", "POST", "DELETE"]),
         ],
         routes=[
             # SSE endpoints
@@ -300,21 +421,39 @@ def run_combined_server(config: dict[str, Any]) -> None:
     )
 
     # Create and run Uvicorn server
-    uvicorn_config = uvicorn.Config(
-        app,
-        host=cast(str, config["host"]),
-        port=cast(int, config["port"]),
-        log_config=None,
-        timeout_graceful_shutdown=0,
-    )
-    server = uvicorn.Server(uvicorn_config)
-    server.run()
+    _make_uvicorn_server(app, host, port).run()
+
+
+# Hosts accepted without parsing them as IP addresses
+_HOST_FASTPATH = frozenset(("127.0.0.1", "0.0.0.0", "localhost", "::1", "::"))  # noqa: S104
 
 
+def validate_host(host: str) -> str:
+    """Validate the host to bind to, falling back to 127.0.0.1 if it is invalid.
+
+    Args:
+        host: Host address from the command line
 
-def parse_args() -> argparse.Namespace:
+    Returns:
+        The host if it is a valid IP address or "localhost", otherwise "127.0.0.1"
+    """
+    if host in _HOST_FASTPATH:
+        return host
+
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        logger.warning("⚠️ Invalid host address '%s', using 127.0.0.1 instead", host)
+        return "127.0.0.1"
+    return host
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command line arguments.
 
+    Args:
+        argv: Arguments to parse (defaults to sys.argv[1:])
+
     Returns:
         Parsed arguments
     """
@@ -375,7 +514,7 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Show what would be cleaned up without actually deleting (only with --cleanup-cache)",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def main() -> int:
@@ -394,7 +533,7 @@ def main() -> int:
         # Set up simple logging for cleanup
         from .tools.git_utils import cleanup_inactive_repositories
         
-        handler = RichHandler(rich_tracebacks=True, markup=True)
+        handler = _make_handler()
         setup_logging(log_level, args.debug, handler, args.log_file, True, False)
         
         logger.info("Running repository cache cleanup")
@@ -435,7 +574,7 @@ def main() -> int:
     # Set up logging
     if console_enabled:
         # Normal rich console logging
-        handler = RichHandler(rich_tracebacks=True, markup=True)
+        handler = _make_handler()
         setup_logging(log_level, args.debug or args.verbose, handler, args.log_file, console_enabled, stderr_only)
     else:
         # Either file-only or stderr-only logging
@@ -461,20 +600,12 @@ def main() -> int:
         # Prepare server configuration
         config = {
             "transport": args.transport.upper(),
-            "host": args.host,
+            "host": validate_host(args.host),
             "port": args.port if args.port is not None else app_config.mcp_port,
             "debug": args.debug,
             "log_level": log_level,
         }
 
-        # Validate host
-        try:
-            ipaddress.ip_address(args.host)
-        except ValueError:
-            if args.host != "localhost":
-                config["host"] = "127.0.0.1"
-                logger.warning("⚠️ Invalid host address '%s', using 127.0.0.1 instead", args.host)
-
         # Run the appropriate server based on transport
         if args.transport == "sse":
             logger.info("🚀 Starting SSE server on %s:%s", config["host"], config["port"])
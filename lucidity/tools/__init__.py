@@ -4,6 +4,22 @@ Lucidity tools module.
 This package contains MCP tools for code analysis and review.
 """
 
-from .code_analysis import analyze_changes
+from typing import Any
 
 __all__ = ["analyze_changes"]
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily import tool functions so importing git_utils alone stays cheap.
+
+    Args:
+        name: Attribute being looked up on the package
+
+    Returns:
+        The requested tool function
+    """
+    if name == "analyze_changes":
+        from .code_analysis import analyze_changes
+
+        return analyze_changes
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,22 +4,135 @@ Code analysis tools for Lucidity.
 This module provides tools for analyzing code quality using MCP.
 """
 
+import asyncio
+import logging
 import os
+import re
 from typing import Any
 
 from ..config import MIN_CODE_CHANGE_BYTES
 from ..context import mcp
-from ..git_command import GitCommandError, run_git_command
+from ..git_command import GitCommandError, GitCommandResult, run_git_command_async
 from ..log import logger
+from ..prompts import analyze_changes_prompt
 from ..validation import is_valid_commit_range, is_valid_path
 from .git_utils import ensure_repository
 
+# Prefix of the line that starts each file section in git diff output
+_DIFF_PREFIX = "diff --git "
+
+# Pin the a/ and b/ path prefixes, whatever diff.noprefix or diff.mnemonicPrefix say
+_DIFF_PATH_PREFIXES = ["--src-prefix=a/", "--dst-prefix=b/"]
+
+# Old and new paths after the prefix; git C-quotes paths with special characters,
+# leaving the new path in group 1 when quoted and in group 2 otherwise
+_DIFF_PATHS_RE = re.compile(r'(?:"a/(?:[^"\\]|\\.)*"|a/.*) (?:"b/((?:[^"\\]|\\.)*)"|b/(.*))')
+
+# Escape sequences git uses in quoted paths, besides three-digit octal bytes
+_QUOTED_PATH_ESCAPES = {
+    b"a": b"\a",
+    b"b": b"\b",
+    b"f": b"\f",
+    b"n": b"\n",
+    b"r": b"\r",
+    b"t": b"\t",
+    b"v": b"\v",
+    b'"': b'"',
+    b"\\": b"\\",
+}
+_QUOTED_PATH_ESCAPE_RE = re.compile(rb"\\([0-7]{3}|.)")
+
+# Generated or vendored files that are not worth analyzing
+_SKIP_SUFFIXES = (".lock", ".sum", ".mod", "package-lock.json", "yarn.lock", ".DS_Store")
+
+# Language by lowercase file extension (without the leading dot)
+_EXT_MAP = {
+    "py": "python",
+    "js": "javascript",
+    "ts": "typescript",
+    "jsx": "jsx",
+    "tsx": "tsx",
+    "html": "html",
+    "css": "css",
+    "scss": "scss",
+    "java": "java",
+    "c": "c",
+    "cpp": "cpp",
+    "h": "c",
+    "hpp": "cpp",
+    "go": "go",
+    "rs": "rust",
+    "php": "php",
+    "rb": "ruby",
+    "swift": "swift",
+    "kt": "kotlin",
+    "kts": "kotlin",
+    "sh": "bash",
+    "md": "markdown",
+    "json": "json",
+    "xml": "xml",
+    "yaml": "yaml",
+    "yml": "yaml",
+    "toml": "toml",
+}
+
+
+def _unquote_path(path: str) -> str:
+    """Decode the body of a path that git C-quoted in its diff output.
 
-def get_git_diff(workspace_root: str, path: str | None = None, commits: str | None = None) -> tuple[str, str]:
-    """Get the current git diff and the staged files content, or diff between commits.
+    Args:
+        path: Quoted path without the surrounding double quotes
+
+    Returns:
+        The path with escape sequences and octal-encoded UTF-8 bytes decoded
+    """
+
+    def replace(match: re.Match[bytes]) -> bytes:
+        escape = match[1]
+        if len(escape) == 3:
+            return bytes((int(escape, 8),))
+        return _QUOTED_PATH_ESCAPES.get(escape, escape)
+
+    return _QUOTED_PATH_ESCAPE_RE.sub(replace, path.encode()).decode(errors="replace")
+
+
+async def _diff_against_head(repo_path: str, options: list[str], paths: list[str]) -> GitCommandResult:
+    """Diff the working tree against HEAD, or against the empty tree if HEAD is unborn.
+
+    The common case stays a single ``git diff HEAD``; HEAD is only checked when that
+    fails, so a repository without commits still reports its staged files.
+
+    Args:
+        repo_path: Path to a local git repository
+        options: Diff options placed before the base (e.g. ``["--name-only"]``)
+        paths: Paths to limit the diff to
+
+    Returns:
+        GitCommandResult of the diff
+
+    Raises:
+        GitCommandError: If the diff fails for a reason other than an unborn HEAD
+    """
+    try:
+        return await run_git_command_async(["diff", *options, "HEAD", *paths], cwd=repo_path)
+    except GitCommandError:
+        head = await run_git_command_async(["rev-parse", "--verify", "--quiet", "HEAD"], cwd=repo_path, check=False)
+        if head.returncode == 0:
+            raise
+
+    logger.debug("HEAD is unborn in %s, diffing against the empty tree", repo_path)
+    empty_tree = await run_git_command_async(["hash-object", "-t", "tree", os.devnull], cwd=repo_path)
+    return await run_git_command_async(["diff", *options, empty_tree.stdout.strip(), *paths], cwd=repo_path)
+
+
+async def get_git_diff(repo_path: str, path: str | None = None, commits: str | None = None) -> str:
+    """Get the diff of uncommitted changes, or the diff between commits.
+
+    Uncommitted changes are diffed against HEAD (or the empty tree in a repository
+    without commits), so staged and unstaged changes come back together.
 
     Args:
-        workspace_root: The root directory of the workspace/git repository (can be a remote URL)
+        repo_path: Path to a local git repository, as resolved by ensure_repository
         path: Optional specific file path to get diff for
         commits: Optional commit range (e.g., "HEAD~1..HEAD", "abc123^..abc123").
                 If provided, gets diff between commits instead of uncommitted changes.
@@ -30,113 +143,59 @@ def get_git_diff(workspace_root: str, path: str | None = None, commits: str | No
                 - "main..feature-branch" - changes in feature branch
 
     Returns:
-        Tuple of (diff_content, staged_files_content).
-        When commits parameter is used, staged_files_content will be empty.
+        The diff content, or an empty string if there is none or it could not be read
     """
     # Validate inputs
     if commits and not is_valid_commit_range(commits):
         logger.error("Invalid commit range format: %s", commits)
-        return "", ""
+        return ""
     
     if path and not is_valid_path(path):
         logger.error("Invalid path format: %s", path)
-        return "", ""
+        return ""
 
-    logger.debug("Getting git diff%s in workspace %s%s", 
-                f" for path: {path}" if path else "", 
-                workspace_root,
-                f" for commits: {commits}" if commits else "")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Getting git diff%s in repository %s%s",
+                     f" for path: {path}" if path else "",
+                     repo_path,
+                     f" for commits: {commits}" if commits else "")
 
     try:
-        # Ensure we have a local git repository (clone if remote)
-        actual_repo_path = ensure_repository(workspace_root)
-        if not actual_repo_path:
-            logger.error("Could not access or clone repository: %s", workspace_root)
-            return "", ""
-
-        workspace_root = actual_repo_path
+        # Normalize path for Windows/WSL
+        paths = [path.replace("\\", "/")] if path else []
 
-        # Build diff command based on whether we're analyzing commits or working directory
         if commits:
-            # Analyze committed changes
-            diff_args = ["diff", commits]
-            if path:
-                normalized_path = path.replace("\\", "/")
-                diff_args.append(normalized_path)
-            
-            logger.debug("Running diff command for commits: %s", diff_args)
-            result = run_git_command(diff_args, cwd=workspace_root)
-            logger.debug("Git diff size: %d bytes", len(result.stdout))
-            
-            # No staged content when analyzing commits
-            return result.stdout, ""
+            result = await run_git_command_async(["diff", *_DIFF_PATH_PREFIXES, commits, *paths], cwd=repo_path)
         else:
-            # Analyze uncommitted changes (original behavior)
-            diff_args = ["diff"]
-            if path:
-                # Normalize path for Windows/WSL
-                normalized_path = path.replace("\\", "/")
-                diff_args.append(normalized_path)
-
-            logger.debug("Running diff command: %s", diff_args)
-            result = run_git_command(diff_args, cwd=workspace_root)
-            logger.debug("Git diff size: %d bytes", len(result.stdout))
-
-            # Get the staged files content
-            staged_args = ["diff", "--cached"]
-            if path:
-                staged_args.append(normalized_path)
-
-            logger.debug("Running staged command: %s", staged_args)
-            staged_result = run_git_command(staged_args, cwd=workspace_root)
-            logger.debug("Git staged diff size: %d bytes", len(staged_result.stdout))
+            # The working tree (staged + unstaged) against HEAD
+            result = await _diff_against_head(repo_path, _DIFF_PATH_PREFIXES, paths)
+        logger.debug("Git diff size: %d bytes", len(result.stdout))
 
-            return result.stdout, staged_result.stdout
+        return result.stdout
 
     except GitCommandError as e:
         logger.error("Error getting git diff: %s", e.stderr)
-        return "", ""
+        return ""
     except Exception as e:
         logger.error("Unexpected error getting git diff: %s", e)
-        return "", ""
+        return ""
 
 
-def get_changed_files(workspace_root: str) -> list[str]:
+async def get_changed_files(repo_path: str) -> list[str]:
     """Get a list of all modified files (both staged and unstaged).
 
     Args:
-        workspace_root: The root directory of the workspace/git repository (can be a remote URL)
+        repo_path: Path to a local git repository, as resolved by ensure_repository
 
     Returns:
         List of modified file paths
     """
-    logger.debug("Getting changed files in workspace %s", workspace_root)
+    logger.debug("Getting changed files in repository %s", repo_path)
 
     try:
-        # Ensure we have a local git repository (clone if remote)
-        actual_repo_path = ensure_repository(workspace_root)
-        if not actual_repo_path:
-            logger.error("Could not access or clone repository: %s", workspace_root)
-            return []
-
-        workspace_root = actual_repo_path
-
-        # Get unstaged modified files using cwd parameter instead of os.chdir
-        unstaged_result = run_git_command(
-            ["diff", "--name-only"],
-            cwd=workspace_root,
-        )
-        unstaged_files = unstaged_result.stdout.strip().split("\n")
-
-        # Get staged modified files
-        staged_result = run_git_command(
-            ["diff", "--cached", "--name-only"],
-            cwd=workspace_root,
-        )
-        staged_files = staged_result.stdout.strip().split("\n")
-
-        # Combine and remove empty entries
-        all_files = list(set(filter(None, unstaged_files + staged_files)))
+        # Staged and unstaged changes relative to HEAD, one path per line
+        result = await _diff_against_head(repo_path, ["--name-only"], [])
+        all_files = [name for name in result.stdout.splitlines() if name]
         logger.debug("Found %d changed files", len(all_files))
 
         return all_files
@@ -149,6 +208,112 @@ def get_changed_files(workspace_root: str) -> list[str]:
         return []
 
 
+def _split_git_diff(diff_content: str) -> dict[str, tuple[str, str, int]]:
+    """Split git diff content into per-file chunks without walking the hunks.
+
+    The diff is split once on its ``diff --git`` boundaries so that each chunk
+    is already the raw diff of a single file.
+
+    Args:
+        diff_content: Raw git diff content
+
+    Returns:
+        Dictionary mapping filenames to (status, chunk, hunk_start), where chunk is the
+        file's raw diff without the leading "diff --git " and hunk_start is the index of
+        the newline before its first hunk header, or -1 if it has none
+    """
+    result: dict[str, tuple[str, str, int]] = {}
+
+    chunks = diff_content.split("\n" + _DIFF_PREFIX)
+    if chunks[0].startswith(_DIFF_PREFIX):
+        chunks[0] = chunks[0][len(_DIFF_PREFIX) :]
+    else:
+        # Anything before the first file header is not part of a file diff
+        del chunks[0]
+
+    for chunk in chunks:
+        # Extract the canonical filename (b/ version) from "a/<path> b/<path>"
+        match = _DIFF_PATHS_RE.fullmatch(chunk.partition("\n")[0])
+        if match is None:
+            continue
+        file_path = match[2] if match[1] is None else _unquote_path(match[1])
+
+        # File metadata ends at the first hunk header
+        hunk_start = chunk.find("\n@@")
+        header = chunk if hunk_start == -1 else chunk[:hunk_start]
+
+        # Check for file status
+        if "\nnew file" in header:
+            status = "added"
+        elif "\ndeleted file" in header:
+            status = "deleted"
+        elif "\nrename from" in header:
+            status = "renamed"
+        else:
+            status = "modified"
+
+        result[file_path] = (status, chunk, hunk_start)
+
+    return result
+
+
+def _parse_file_diff(status: str, chunk: str, hunk_start: int) -> dict[str, Any]:
+    """Build the diff info for a single file chunk from _split_git_diff.
+
+    Args:
+        status: File status (added, deleted, renamed or modified)
+        chunk: The file's raw diff without the leading "diff --git "
+        hunk_start: Index of the newline before the first hunk header, or -1
+
+    Returns:
+        Diff info for the file
+    """
+    if hunk_start == -1:
+        header, body = chunk, ""
+    else:
+        header, body = chunk[:hunk_start], chunk[hunk_start + 1 :]
+
+    # Collect hunk headers, changed lines and the original/modified code in a
+    # single pass over the body; "---"/"+++" lines live in the header above.
+    # Anything else (e.g. "\\ No newline at end of file") is left out of both
+    # content and raw_diff
+    header_lines = [_DIFF_PREFIX + header]
+    content_lines: list[str] = []
+    raw_lines = [_DIFF_PREFIX + header]
+    original_lines: list[str] = []
+    modified_lines: list[str] = []
+    for line in body.split("\n"):
+        first = line[:1]
+        if first == "+":
+            modified_lines.append(line[1:])
+        elif first == "-":
+            original_lines.append(line[1:])
+        elif first == " ":
+            # Context lines belong to both sides; slice once and share the string
+            unchanged = line[1:]
+            original_lines.append(unchanged)
+            modified_lines.append(unchanged)
+        elif first == "@":
+            header_lines.append(line)
+            raw_lines.append(line)
+            continue
+        else:
+            continue
+        content_lines.append(line)
+        raw_lines.append(line)
+    raw_lines.append("")
+
+    return {
+        "status": status,
+        "content": "\n".join(content_lines),
+        "original_content": "",
+        "header": "\n".join(header_lines),
+        "raw_diff": "\n".join(raw_lines),
+        "original_code": "\n".join(original_lines),
+        "modified_code": "\n".join(modified_lines),
+    }
+
+
 def parse_git_diff(diff_content: str) -> dict[str, dict[str, Any]]:
     """Parse git diff content into a structured format.
 
@@ -158,100 +323,45 @@ def parse_git_diff(diff_content: str) -> dict[str, dict[str, Any]]:
     Returns:
         Dictionary mapping filenames to their diff info
     """
-    result: dict[str, dict[str, Any]] = {}
-    current_file: str | None = None
-    current_content: list[str] = []
-    current_header: list[str] = []
-
-    lines = diff_content.split("\n")
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Check for file header
-        if line.startswith("diff --git "):
-            # Save previous file content if any
-            if current_file is not None:
-                result[current_file]["content"] = "\n".join(current_content)
-                result[current_file]["header"] = "\n".join(current_header)
-                current_content = []
-                current_header = []
-
-            # Extract filename from diff header
-            parts = line.split(" ")
-            if len(parts) >= 4:
-                # Extract the canonical filename (b/ version)
-                file_path = parts[3][2:]  # Remove 'b/' prefix
-                current_file = file_path
-                result[current_file] = {
-                    "status": "modified",
-                    "content": "",
-                    "original_content": "",
-                    "header": line,
-                    "raw_diff": line + "\n",
-                }
-                current_header.append(line)
-
-            # Skip file metadata lines and collect headers
-            while i + 1 < len(lines) and not lines[i + 1].startswith("@@"):
-                i += 1
-                if i < len(lines) and current_file is not None:
-                    current_header.append(lines[i])
-                    result[current_file]["raw_diff"] += lines[i] + "\n"
-
-                    # Check for file status
-                    if lines[i].startswith("new file"):
-                        result[current_file]["status"] = "added"
-                    elif lines[i].startswith("deleted file"):
-                        result[current_file]["status"] = "deleted"
-                    elif lines[i].startswith("rename from"):
-                        result[current_file]["status"] = "renamed"
-
-        # Collect diff hunk headers
-        elif current_file is not None and line.startswith("@@"):
-            current_header.append(line)
-            result[current_file]["raw_diff"] += line + "\n"
-
-        # Collect diff content
-        elif current_file is not None and (line.startswith(("+", "-", " "))):
-            current_content.append(line)
-            result[current_file]["raw_diff"] += line + "\n"
-
-        i += 1
-
-    # Save the last file content
-    if current_file is not None and current_content:
-        result[current_file]["content"] = "\n".join(current_content)
-        result[current_file]["header"] = "\n".join(current_header)
-
-    return result
+    return {
+        file_path: _parse_file_diff(*file_diff) for file_path, file_diff in _split_git_diff(diff_content).items()
+    }
 
 
 def extract_code_from_diff(diff_info: dict[str, Any]) -> tuple[str, str]:
     """Extract the original and modified code from diff info.
 
+    Diff info produced by parse_git_diff already carries both, so only a bare
+    ``content`` entry needs to be walked here.
+
     Args:
         diff_info: Dictionary containing diff information
 
     Returns:
         Tuple of (original_code, modified_code)
     """
+    if "modified_code" in diff_info:
+        return diff_info["original_code"], diff_info["modified_code"]
+
     original_lines = []
     modified_lines = []
 
     # Process the diff content
     for line in diff_info["content"].split("\n"):
-        if line.startswith("+") and not line.startswith("+++"):
+        first = line[:1]
+        if first == "+":
             # Line added
-            modified_lines.append(line[1:])
-        elif line.startswith("-") and not line.startswith("---"):
+            if line[:3] != "+++":
+                modified_lines.append(line[1:])
+        elif first == "-":
             # Line removed
-            original_lines.append(line[1:])
-        elif line.startswith(" "):
+            if line[:3] != "---":
+                original_lines.append(line[1:])
+        elif first == " ":
             # Line unchanged
-            original_lines.append(line[1:])
-            modified_lines.append(line[1:])
+            unchanged = line[1:]
+            original_lines.append(unchanged)
+            modified_lines.append(unchanged)
 
     return "\n".join(original_lines), "\n".join(modified_lines)
 
@@ -265,42 +375,12 @@ def detect_language(filename: str) -> str:
     Returns:
         The detected language or 'text' if unknown
     """
-    extension_map = {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".jsx": "jsx",
-        ".tsx": "tsx",
-        ".html": "html",
-        ".css": "css",
-        ".scss": "scss",
-        ".java": "java",
-        ".c": "c",
-        ".cpp": "cpp",
-        ".h": "c",
-        ".hpp": "cpp",
-        ".go": "go",
-        ".rs": "rust",
-        ".php": "php",
-        ".rb": "ruby",
-        ".swift": "swift",
-        ".kt": "kotlin",
-        ".kts": "kotlin",
-        ".sh": "bash",
-        ".md": "markdown",
-        ".json": "json",
-        ".xml": "xml",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".toml": "toml",
-    }
-
-    _, ext = os.path.splitext(filename)
-    return extension_map.get(ext.lower(), "text")
+    _, dot, ext = filename.rpartition(".")
+    return _EXT_MAP.get(ext.lower(), "text") if dot else "text"
 
 
 @mcp.tool("analyze_changes")
-def analyze_changes(workspace_root: str = "", path: str = "", commits: str | None = None) -> dict[str, Any]:
+async def analyze_changes(workspace_root: str = "", path: str = "", commits: str | None = None) -> dict[str, Any]:
     """Prepare git changes for analysis through MCP.
 
     This tool examines git changes (either uncommitted or committed), extracts changed code,
@@ -390,9 +470,9 @@ def analyze_changes(workspace_root: str = "", path: str = "", commits: str | Non
     if not workspace_root:
         return {"status": "error", "message": "workspace_root parameter is required"}
 
-    # First, ensure we can access the repository (will clone if remote)
-    from .git_utils import ensure_repository
-    actual_repo_path = ensure_repository(workspace_root)
+    # Resolve the repository once (will clone if remote) and reuse the local path below;
+    # cloning can take a while, so keep it off the event loop
+    actual_repo_path = await asyncio.to_thread(ensure_repository, workspace_root)
     
     # Check if repository access failed
     if not actual_repo_path:
@@ -423,21 +503,19 @@ def analyze_changes(workspace_root: str = "", path: str = "", commits: str | Non
                 "message": f"Could not access or clone repository: {workspace_root}"
             }
 
-    # Get git diff
+    # Get git diff and the list of all changed files concurrently. An unfiltered diff of
+    # uncommitted changes already names every changed file, so the list comes from it instead
     logger.debug("Fetching git diff...")
-    diff_content, staged_content = get_git_diff(workspace_root, path, commits)
-
-    # Get list of all changed files
-    changed_files = get_changed_files(workspace_root)
-
-    # Combine diff and staged content for complete changes
-    combined_diff = diff_content
-    if staged_content:
-        combined_diff = combined_diff + "\n" + staged_content if combined_diff else staged_content
-
-    logger.debug("Combined diff size: %d bytes", len(combined_diff))
+    changed_files: list[str] | None = None
+    if path or commits:
+        diff_content, changed_files = await asyncio.gather(
+            get_git_diff(actual_repo_path, path, commits),
+            get_changed_files(actual_repo_path),
+        )
+    else:
+        diff_content = await get_git_diff(actual_repo_path)
 
-    if not combined_diff:
+    if not diff_content:
         if commits:
             logger.warning("No changes detected in commit range: %s", commits)
             return {
@@ -460,11 +538,14 @@ def analyze_changes(workspace_root: str = "", path: str = "", commits: str | Non
                 "file_list": []
             }
 
-    # Parse the diff
+    # Split the diff per file; hunks are only parsed for files that are analyzed
     logger.debug("Parsing git diff...")
-    parsed_diff = parse_git_diff(combined_diff)
+    file_diffs = _split_git_diff(diff_content)
+
+    if changed_files is None:
+        changed_files = list(file_diffs) if file_diffs else await get_changed_files(actual_repo_path)
 
-    if not parsed_diff:
+    if not file_diffs:
         logger.warning("No parseable changes in git diff")
         return {
             "status": "no_changes",
@@ -472,24 +553,30 @@ def analyze_changes(workspace_root: str = "", path: str = "", commits: str | Non
             "file_list": changed_files,
         }
 
-    logger.info("Found %d files with changes to analyze", len(parsed_diff))
+    logger.info("Found %d files with changes to analyze", len(file_diffs))
 
     # Process each changed file
     analysis_results = {}
-    file_list = []
+    file_list = list(file_diffs)
 
-    for filename, diff_info in parsed_diff.items():
-        logger.debug("Processing file: %s (status: %s)", filename, diff_info["status"])
-        file_list.append(filename)
+    for filename, (status, chunk, hunk_start) in file_diffs.items():
+        logger.debug("Processing file: %s (status: %s)", filename, status)
 
         # Skip certain files
-        if filename.endswith((".lock", ".sum", ".mod", "package-lock.json", "yarn.lock", ".DS_Store")):
+        if filename.endswith(_SKIP_SUFFIXES):
             logger.debug("Skipping excluded file: %s", filename)
             continue
 
+        # The hunk body bounds the size of the modified code, so files without hunks
+        # (renames, mode changes, binary files) and tiny bodies are skipped unparsed
+        if hunk_start == -1 or len(chunk) - hunk_start - 1 < MIN_CODE_CHANGE_BYTES:
+            logger.debug("Skipping %s - insufficient code changes (< %d chars)", filename, MIN_CODE_CHANGE_BYTES)
+            continue
+
         try:
             # Extract original and modified code
             logger.debug("Extracting code changes for %s", filename)
+            diff_info = _parse_file_diff(status, chunk, hunk_start)
             original_code, modified_code = extract_code_from_diff(diff_info)
 
             # Skip if no significant code changes
@@ -499,12 +586,10 @@ def analyze_changes(workspace_root: str = "", path: str = "", commits: str | Non
 
             # Detect language
             language = detect_language(filename)
-            logger.debug("Detected language for %s: %s", filename, language)
 
             # Create a prompt for analysis
+            logger.debug("Detected language for %s: %s", filename, language)
             logger.debug("Generating analysis prompt for %s", filename)
-            from ..prompts import analyze_changes_prompt
-
             analysis_prompt = analyze_changes_prompt(
                 code=modified_code, language=language, original_code=original_code if original_code else None
             )
@@ -512,7 +597,7 @@ def analyze_changes(workspace_root: str = "", path: str = "", commits: str | Non
 
             # Store the analysis prompt to be returned
             analysis_results[filename] = {
-                "status": diff_info["status"],
+                "status": status,
                 "language": language,
                 "analysis_prompt": analysis_prompt,
                 "raw_diff": diff_info["raw_diff"],
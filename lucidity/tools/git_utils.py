@@ -8,18 +8,33 @@ This module provides utilities to:
 - Clean up inactive repository caches
 """
 
+import hashlib
 import os
 import shutil
+import stat
 import subprocess
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from ..config import get_config
+from ..config import Config, get_config
 from ..git_command import GitCommandError, GitTimeoutError, run_git_command
 from ..log import logger
 from ..validation import is_valid_branch_name
 
+# Upper bound on repositories sized and removed concurrently during cache cleanup
+_CLEANUP_WORKERS = 8
+
+# Clone path -> time.monotonic() of its last successful clone or fetch
+_last_fetched: dict[str, float] = {}
+
+# Clone path -> lock held while that clone is created or updated; entries vanish once no caller holds them
+_clone_locks: weakref.WeakValueDictionary[str, threading.Lock] = weakref.WeakValueDictionary()
+_clone_locks_guard = threading.Lock()
+
 
 def get_cache_directory() -> str:
     """Get the base directory for caching cloned repositories.
@@ -37,14 +52,20 @@ def get_cache_directory() -> str:
 def is_git_repository(path: str) -> bool:
     """Check if the given path is a git repository.
 
+    A ``.git`` directory marks a regular checkout, while a ``.git`` file marks a
+    linked worktree or submodule pointing at its git directory elsewhere.
+
     Args:
         path: The directory path to check
 
     Returns:
         True if the path is a git repository, False otherwise
     """
-    git_dir = os.path.join(path, ".git")
-    return os.path.exists(git_dir) and os.path.isdir(git_dir)
+    try:
+        mode = os.stat(os.path.join(path, ".git")).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISDIR(mode) or stat.S_ISREG(mode)
 
 
 def extract_repo_info_from_path(workspace_root: str) -> dict[str, Any] | None:
@@ -74,8 +95,26 @@ def extract_repo_info_from_path(workspace_root: str) -> dict[str, Any] | None:
         return None
 
     # Try to detect if this looks like a git URL
-    workspace_root = workspace_root.strip()
+    parsed = _parse_repo_spec(workspace_root.strip())
+    if parsed is None:
+        return None
+
+    url, name, branch = parsed
+    result: dict[str, Any] = {"url": url, "name": name}
+    if branch:
+        result["branch"] = branch
+    return result
+
+
+def _parse_repo_spec(workspace_root: str) -> tuple[str, str, str | None] | None:
+    """Parse a remote repository specification.
 
+    Args:
+        workspace_root: Stripped repository URL or short form, optionally with @branch suffix
+
+    Returns:
+        Tuple of (url, name, branch) if parseable, None otherwise
+    """
     # Check for branch specification in the format @branch at the end
     branch = None
     # First check if it starts with git@ to avoid splitting on that @
@@ -113,18 +152,12 @@ def extract_repo_info_from_path(workspace_root: str) -> dict[str, Any] | None:
     # Handle SSH format: git@github.com:username/repo.git
     if workspace_root.startswith("git@"):
         logger.debug("Detected SSH git URL format: %s", workspace_root)
-        result = {"url": workspace_root, "name": _extract_repo_name(workspace_root)}
-        if branch:
-            result["branch"] = branch
-        return result
+        return workspace_root, _extract_repo_name(workspace_root), branch
 
     # Handle HTTPS format: https://github.com/username/repo.git
     if workspace_root.startswith(("https://", "http://")):
         logger.debug("Detected HTTPS git URL format: %s", workspace_root)
-        result = {"url": workspace_root, "name": _extract_repo_name(workspace_root)}
-        if branch:
-            result["branch"] = branch
-        return result
+        return workspace_root, _extract_repo_name(workspace_root), branch
 
     # Handle github.com/username/repo format
     if "/" in workspace_root and not workspace_root.startswith("/"):
@@ -138,10 +171,7 @@ def extract_repo_info_from_path(workspace_root: str) -> dict[str, Any] | None:
             repo = parts[2]
             ssh_url = f"git@github.com:{username}/{repo}.git"
             logger.debug("Detected GitHub format: %s -> %s", workspace_root, ssh_url)
-            result = {"url": ssh_url, "name": _extract_repo_name(repo)}
-            if branch:
-                result["branch"] = branch
-            return result
+            return ssh_url, _extract_repo_name(repo), branch
 
         # Check if it's in username/repo format (exactly 2 parts)
         if len(parts) == 2 and not parts[0].startswith("."):
@@ -150,10 +180,7 @@ def extract_repo_info_from_path(workspace_root: str) -> dict[str, Any] | None:
             repo = parts[1]
             ssh_url = f"git@github.com:{username}/{repo}.git"
             logger.debug("Detected short GitHub format: %s -> %s", workspace_root, ssh_url)
-            result = {"url": ssh_url, "name": _extract_repo_name(repo)}
-            if branch:
-                result["branch"] = branch
-            return result
+            return ssh_url, _extract_repo_name(repo), branch
 
     return None
 
@@ -177,13 +204,18 @@ def _extract_repo_name(url: str) -> str:
     return parts[-1] if parts else "repo"
 
 
-def get_clone_directory(repo_name: str) -> str:
+def get_clone_directory(repo_name: str, repo_url: str | None = None, branch: str | None = None) -> str:
     """Get the directory path where a repository should be cloned.
 
     Creates a directory structure for cloned repositories in the cache directory.
+    When the repository URL is given, the directory name also carries a short hash
+    of the URL and branch, so forks sharing a name (or different branches of one
+    repository) get separate clones instead of overwriting each other.
 
     Args:
         repo_name: Name of the repository
+        repo_url: Optional git repository URL the clone comes from
+        branch: Optional branch the clone tracks
 
     Returns:
         Path to the directory where the repo should be cloned
@@ -192,6 +224,10 @@ def get_clone_directory(repo_name: str) -> str:
     clone_base = get_cache_directory()
     os.makedirs(clone_base, exist_ok=True)
 
+    if repo_url:
+        digest = hashlib.sha256(f"{repo_url}@{branch or ''}".encode()).hexdigest()[:12]
+        repo_name = f"{repo_name}-{digest}"
+
     return os.path.join(clone_base, repo_name)
 
 
@@ -206,8 +242,11 @@ def touch_repository_access(repo_path: str) -> None:
     """
     try:
         access_file = os.path.join(repo_path, ".last_accessed")
-        # Create or update the file's modification time
-        Path(access_file).touch()
+        # Update the file's modification time, creating it on first access
+        try:
+            os.utime(access_file)
+        except FileNotFoundError:
+            Path(access_file).touch()
         logger.debug("Updated access time for repository: %s", repo_path)
     except Exception as e:
         logger.warning("Failed to update access time for %s: %s", repo_path, e)
@@ -216,6 +255,10 @@ def touch_repository_access(repo_path: str) -> None:
 def clone_repository(repo_url: str, repo_name: str, branch: str | None = None) -> str | None:
     """Clone a git repository to a temporary location.
 
+    The clone is a blobless partial clone: all commits and trees are fetched so any
+    commit range can be diffed, while file contents are only downloaded when a
+    checkout or diff actually needs them.
+
     Args:
         repo_url: The git repository URL to clone
         repo_name: Name for the cloned repository directory
@@ -229,9 +272,41 @@ def clone_repository(repo_url: str, repo_name: str, branch: str | None = None) -
         logger.error("Invalid branch name: %s", branch)
         return None
 
-    clone_path = get_clone_directory(repo_name)
+    clone_path = get_clone_directory(repo_name, repo_url, branch)
     config = get_config()
 
+    # Concurrent requests for the same repository wait for the first one, which then
+    # lets them reuse its fresh clone; different repositories still proceed in parallel
+    with _clone_lock(clone_path):
+        return _clone_or_update(repo_url, clone_path, branch, config)
+
+
+def _clone_lock(clone_path: str) -> threading.Lock:
+    """Get the lock serializing clone and update work on one cache directory.
+
+    Args:
+        clone_path: Path of the cached clone
+
+    Returns:
+        Lock shared by every caller using the same clone path; callers must keep a
+        reference to it while it is in use, as unused locks are dropped
+    """
+    with _clone_locks_guard:
+        return _clone_locks.setdefault(clone_path, threading.Lock())
+
+
+def _clone_or_update(repo_url: str, clone_path: str, branch: str | None, config: Config) -> str | None:
+    """Clone a repository into its cache directory, or update the existing clone.
+
+    Args:
+        repo_url: The git repository URL to clone
+        clone_path: Cache directory for this URL and branch
+        branch: Optional branch name to clone
+        config: Active configuration
+
+    Returns:
+        Path to the cloned repository, or None if cloning failed
+    """
     logger.info("Attempting to clone repository %s to %s", repo_url, clone_path)
     if branch:
         logger.info("Will checkout branch: %s", branch)
@@ -239,6 +314,10 @@ def clone_repository(repo_url: str, repo_name: str, branch: str | None = None) -
     try:
         # If the directory already exists and is a git repo, try to update it instead
         if is_git_repository(clone_path):
+            if _fetched_recently(clone_path, config.fetch_ttl):
+                logger.info("Repository at %s was fetched recently, skipping update", clone_path)
+                touch_repository_access(clone_path)
+                return clone_path
             logger.info("Repository already exists at %s, attempting to update", clone_path)
             if update_repository(clone_path, branch):
                 return clone_path
@@ -246,8 +325,12 @@ def clone_repository(repo_url: str, repo_name: str, branch: str | None = None) -
             # If update fails, remove and re-clone
             shutil.rmtree(clone_path)
 
-        # Build clone command
-        clone_args = ["clone", repo_url, clone_path]
+        # The cache directory is only created once per process, but something like a
+        # tmp cleaner may have removed it since; a fresh clone is rare enough to recheck
+        os.makedirs(os.path.dirname(clone_path), exist_ok=True)
+
+        # Build clone command; skip downloading blobs up front (see docstring)
+        clone_args = ["clone", "--filter=blob:none", repo_url, clone_path]
         if branch:
             # Clone specific branch for efficiency
             clone_args.extend(["--branch", branch])
@@ -260,6 +343,7 @@ def clone_repository(repo_url: str, repo_name: str, branch: str | None = None) -
         )
         logger.debug("Clone output: %s", result.stdout)
         logger.info("Successfully cloned repository to %s", clone_path)
+        _last_fetched[clone_path] = time.monotonic()
         
         # Track repository access time
         touch_repository_access(clone_path)
@@ -269,26 +353,47 @@ def clone_repository(repo_url: str, repo_name: str, branch: str | None = None) -
     except GitTimeoutError:
         logger.error("Timeout while cloning repository %s", repo_url)
         # Clean up partial clone
-        if os.path.exists(clone_path):
-            logger.debug("Cleaning up partial clone at %s", clone_path)
-            shutil.rmtree(clone_path)
+        _remove_failed_clone(clone_path)
         return None
     except GitCommandError as e:
         logger.error("Error cloning repository %s: %s", repo_url, e.stderr)
         # Clean up failed clone
-        if os.path.exists(clone_path):
-            logger.debug("Cleaning up failed clone at %s", clone_path)
-            shutil.rmtree(clone_path)
+        _remove_failed_clone(clone_path)
         return None
     except Exception as e:
         logger.error("Unexpected error cloning repository %s: %s", repo_url, e)
         # Clean up on any error
-        if os.path.exists(clone_path):
-            logger.debug("Cleaning up failed clone at %s", clone_path)
-            shutil.rmtree(clone_path)
+        _remove_failed_clone(clone_path)
         return None
 
 
+def _remove_failed_clone(clone_path: str) -> None:
+    """Remove whatever a failed clone left behind, if anything.
+
+    Errors are ignored (including the directory not existing) so cleanup
+    never masks the failure that triggered it.
+
+    Args:
+        clone_path: Path the clone was being written to
+    """
+    logger.debug("Cleaning up failed clone at %s", clone_path)
+    shutil.rmtree(clone_path, ignore_errors=True)
+
+
+def _fetched_recently(repo_path: str, ttl: int) -> bool:
+    """Check whether a cached clone was cloned or fetched within the last ``ttl`` seconds.
+
+    Args:
+        repo_path: Path to the cached repository
+        ttl: Freshness window in seconds; 0 or less always reports stale
+
+    Returns:
+        True if the repository can be reused without fetching again
+    """
+    fetched_at = _last_fetched.get(repo_path)
+    return fetched_at is not None and time.monotonic() - fetched_at < ttl
+
+
 def update_repository(repo_path: str, branch: str | None = None) -> bool:
     """Update an existing git repository by fetching latest changes.
 
@@ -314,9 +419,11 @@ def update_repository(repo_path: str, branch: str | None = None) -> bool:
         logger.info("Will checkout branch: %s", branch)
 
     try:
-        # Fetch latest changes using cwd parameter instead of os.chdir
+        # Fetch latest changes using cwd parameter instead of os.chdir. Clones never
+        # check out submodules, so keep a user's submodule.recurse setting from
+        # fetching them anyway
         run_git_command(
-            ["fetch", "--all"],
+            ["fetch", "--all", "--no-recurse-submodules"],
             cwd=repo_path,
             timeout=config.fetch_timeout,
         )
@@ -331,15 +438,17 @@ def update_repository(repo_path: str, branch: str | None = None) -> bool:
             )
             logger.debug("Checked out branch: %s", branch)
 
-        # Pull changes for the current branch
+        # Fast-forward to the upstream commits fetched above; unlike pull this
+        # stays local instead of contacting the remote a second time
         run_git_command(
-            ["pull"],
+            ["merge", "--ff-only", "@{upstream}"],
             cwd=repo_path,
-            timeout=config.fetch_timeout,
+            timeout=30,
         )
-        logger.debug("Successfully pulled changes")
+        logger.debug("Successfully fast-forwarded to upstream")
 
         logger.info("Successfully updated repository at %s", repo_path)
+        _last_fetched[repo_path] = time.monotonic()
         
         # Track repository access time
         touch_repository_access(repo_path)
@@ -408,6 +517,71 @@ def ensure_repository(workspace_root: str) -> str | None:
     return None
 
 
+def _repository_size(repo_path: str) -> int:
+    """Calculate the on-disk size of a repository directory.
+
+    Uses ``du`` for speed, falling back to walking the tree when it is unavailable
+    (for example on systems whose ``du`` lacks ``-b``).
+
+    Args:
+        repo_path: Path to the repository directory
+
+    Returns:
+        Size in bytes (0 if it could not be determined)
+    """
+    try:
+        result = subprocess.run(
+            ["du", "-sb", repo_path],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=False,
+        )
+        if result.returncode == 0:
+            return int(result.stdout.split()[0])
+    except (subprocess.TimeoutExpired, ValueError, OSError) as e:
+        logger.warning("Error running du command for %s: %s, falling back to a directory walk", repo_path, e)
+
+    # Walk with scandir so each file costs one stat; DirEntry already knows its type
+    repo_size = 0
+    pending = [repo_path]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError as walk_error:
+            logger.warning("Error calculating size for %s: %s", repo_path, walk_error)
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    else:
+                        repo_size += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass  # Skip files we can't access
+    return repo_size
+
+
+def _size_and_remove(repo_path: str, dry_run: bool) -> tuple[int, Exception | None]:
+    """Measure a cached repository and, unless this is a dry run, delete it.
+
+    Args:
+        repo_path: Path to the repository directory
+        dry_run: If True, only measure the repository
+
+    Returns:
+        Tuple of (size in bytes, removal error or None)
+    """
+    repo_size = _repository_size(repo_path)
+    if not dry_run:
+        try:
+            shutil.rmtree(repo_path)
+        except Exception as e:
+            return repo_size, e
+    return repo_size, None
+
+
 def cleanup_inactive_repositories(days: int = 7, dry_run: bool = False) -> dict[str, Any]:
     """Clean up repository caches that haven't been accessed in the specified number of days.
 
@@ -450,89 +624,67 @@ def cleanup_inactive_repositories(days: int = 7, dry_run: bool = False) -> dict[
     removed = 0
     freed_bytes = 0
     removed_repos = []
+    expired: list[tuple[str, str, float]] = []
     
     try:
-        for entry in os.listdir(cache_dir):
-            repo_path = os.path.join(cache_dir, entry)
-            
-            # Skip non-directories
-            if not os.path.isdir(repo_path):
-                continue
-            
-            scanned += 1
-            
-            # Check if it's a git repository
-            if not is_git_repository(repo_path):
-                logger.debug("Skipping non-git directory: %s", repo_path)
-                continue
-            
-            # Check access time via .last_accessed file
-            access_file = os.path.join(repo_path, ".last_accessed")
-            
-            # If no .last_accessed file, check directory modification time as fallback
-            if os.path.exists(access_file):
-                last_access = os.path.getmtime(access_file)
-            else:
-                # Use directory modification time if .last_accessed doesn't exist
-                last_access = os.path.getmtime(repo_path)
-            
-            # Check if repository is inactive
-            if last_access < cutoff_time:
-                # Calculate size before deletion using du command for better performance
-                repo_size = 0
+        # scandir reports entry types from the directory read itself, saving a stat per entry
+        with os.scandir(cache_dir) as entries:
+            for dir_entry in entries:
+                entry = dir_entry.name
+                repo_path = dir_entry.path
+
+                # Skip non-directories
+                if not dir_entry.is_dir():
+                    continue
+
+                scanned += 1
+
+                # Check if it's a git repository
+                if not is_git_repository(repo_path):
+                    logger.debug("Skipping non-git directory: %s", repo_path)
+                    continue
+
+                # Check access time via .last_accessed file
                 try:
-                    result = subprocess.run(
-                        ["du", "-sb", repo_path],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                        check=False,
-                    )
-                    if result.returncode == 0:
-                        repo_size = int(result.stdout.split()[0])
-                    else:
-                        # Fallback to os.walk if du fails
-                        for dirpath, dirnames, filenames in os.walk(repo_path):
-                            for filename in filenames:
-                                filepath = os.path.join(dirpath, filename)
-                                try:
-                                    repo_size += os.path.getsize(filepath)
-                                except OSError:
-                                    pass  # Skip files we can't access
-                except (subprocess.TimeoutExpired, ValueError, OSError, FileNotFoundError) as e:
-                    logger.warning("Error running du command for %s: %s, falling back to os.walk", repo_path, e)
-                    # Fallback to os.walk if du is not available or fails
-                    try:
-                        for dirpath, dirnames, filenames in os.walk(repo_path):
-                            for filename in filenames:
-                                filepath = os.path.join(dirpath, filename)
-                                try:
-                                    repo_size += os.path.getsize(filepath)
-                                except OSError:
-                                    pass  # Skip files we can't access
-                    except OSError as walk_error:
-                        logger.warning("Error calculating size with os.walk for %s: %s", repo_path, walk_error)
-                
-                days_inactive = (current_time - last_access) / (24 * 60 * 60)
-                logger.info(
-                    "%s repository: %s (%.1f days inactive, ~%.2f MB)",
-                    "Would remove" if dry_run else "Removing",
-                    entry,
-                    days_inactive,
-                    repo_size / (1024 * 1024),
-                )
-                
-                if not dry_run:
-                    try:
-                        shutil.rmtree(repo_path)
-                        logger.info("Successfully removed %s", repo_path)
-                    except Exception as e:
-                        logger.error("Failed to remove %s: %s", repo_path, e)
-                        continue
-                
-                removed += 1
-                freed_bytes += repo_size
-                removed_repos.append(entry)
+                    last_access = os.stat(os.path.join(repo_path, ".last_accessed")).st_mtime
+                except FileNotFoundError:
+                    # Use directory modification time if .last_accessed doesn't exist
+                    last_access = dir_entry.stat().st_mtime
+
+                # Check if repository is inactive
+                if last_access < cutoff_time:
+                    expired.append((entry, repo_path, last_access))
+
+        # Sizing and removal are independent per repository and spend their time in
+        # subprocesses and syscalls, so overlap them; results are reported in scan order
+        if expired:
+            workers = min(_CLEANUP_WORKERS, len(expired))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                paths = [repo_path for _, repo_path, _ in expired]
+                outcomes = list(pool.map(_size_and_remove, paths, [dry_run] * len(paths)))
+        else:
+            outcomes = []
+
+        for (entry, repo_path, last_access), (repo_size, error) in zip(expired, outcomes, strict=True):
+            days_inactive = (current_time - last_access) / (24 * 60 * 60)
+            logger.info(
+                "%s repository: %s (%.1f days inactive, ~%.2f MB)",
+                "Would remove" if dry_run else "Removing",
+                entry,
+                days_inactive,
+                repo_size / (1024 * 1024),
+            )
+
+            if error is not None:
+                logger.error("Failed to remove %s: %s", repo_path, error)
+                continue
+            if not dry_run:
+                _last_fetched.pop(repo_path, None)
+                logger.info("Successfully removed %s", repo_path)
+
+            removed += 1
+            freed_bytes += repo_size
+            removed_repos.append(entry)
     
     except Exception as e:
         logger.error("Error during cleanup: %s", e)
@@ -8,13 +8,19 @@ This module provides validation functions to prevent:
 """
 
 import re
+import string
 
 
 # Regex patterns for validation
-SAFE_BRANCH_PATTERN = re.compile(r"^[a-zA-Z0-9/_.-]+$")
 COMMIT_RANGE_PATTERN = re.compile(r"^[a-zA-Z0-9~^./_-]+\.\.[a-zA-Z0-9~^./_-]+$")
 COMMIT_SHA_PATTERN = re.compile(r"^[a-fA-F0-9]{7,40}$")
 
+# Characters allowed in branch names
+_BRANCH_CHARACTERS = frozenset(string.ascii_letters + string.digits + "/_.-")
+
+# Characters that could chain or substitute commands if an argument reached a shell
+_SHELL_METACHARACTERS = frozenset(";&|$`\n\r")
+
 
 def is_valid_branch_name(branch: str) -> bool:
     """Validate branch name to prevent directory traversal and injection attacks.
@@ -42,8 +48,8 @@ def is_valid_branch_name(branch: str) -> bool:
     if ".." in branch or branch.startswith((".", "-")):
         return False
 
-    # Validate against safe pattern
-    return bool(SAFE_BRANCH_PATTERN.match(branch))
+    # Validate against the allowed characters in a single C-level pass
+    return _BRANCH_CHARACTERS.issuperset(branch)
 
 
 def is_valid_commit_range(commits: str) -> bool:
@@ -69,7 +75,7 @@ def is_valid_commit_range(commits: str) -> bool:
         return False
 
     # Check for injection attempts
-    if any(char in commits for char in [";", "&", "|", "$", "`", "\n", "\r"]):
+    if not _SHELL_METACHARACTERS.isdisjoint(commits):
         return False
 
     # Check for git options (starting with -)
@@ -77,7 +83,7 @@ def is_valid_commit_range(commits: str) -> bool:
         return False
 
     # Validate against safe pattern
-    return bool(COMMIT_RANGE_PATTERN.match(commits))
+    return bool(COMMIT_RANGE_PATTERN.fullmatch(commits))
 
 
 def is_valid_path(path: str) -> bool:
@@ -121,7 +127,7 @@ def is_valid_path(path: str) -> bool:
         return False
 
     # Check for shell metacharacters
-    if any(char in path for char in [";", "&", "|", "$", "`", "\n", "\r"]):
+    if not _SHELL_METACHARACTERS.isdisjoint(path):
         return False
 
     return True
@@ -145,7 +151,7 @@ def sanitize_git_command_args(args: list[str]) -> list[str]:
             raise ValueError(f"Argument must be string, got {type(arg)}")
 
         # Check for shell metacharacters
-        if any(char in arg for char in [";", "&", "|", "$", "`", "\n", "\r"]):
+        if not _SHELL_METACHARACTERS.isdisjoint(arg):
             raise ValueError(f"Argument contains shell metacharacters: {arg}")
 
         sanitized.append(arg)
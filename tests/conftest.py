@@ -0,0 +1,14 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import subprocess
+
+import pytest
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """An empty git repository in a temporary directory."""
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)  # noqa: S603, S607
+    return tmp_path
@@ -2,14 +2,18 @@
 Tests for configuration management.
 """
 
+import dataclasses
 import os
 from unittest.mock import patch
 
+import pytest
+
 from lucidity.config import (
     DEFAULT_CACHE_DIR,
     DEFAULT_CLONE_TIMEOUT_SECONDS,
     DEFAULT_CORS_ORIGINS,
     DEFAULT_FETCH_TIMEOUT_SECONDS,
+    DEFAULT_FETCH_TTL_SECONDS,
     DEFAULT_MCP_PORT,
     Config,
     get_config,
@@ -24,6 +28,7 @@ def test_default_config():
         assert config.cache_dir == DEFAULT_CACHE_DIR
         assert config.clone_timeout == DEFAULT_CLONE_TIMEOUT_SECONDS
         assert config.fetch_timeout == DEFAULT_FETCH_TIMEOUT_SECONDS
+        assert config.fetch_ttl == DEFAULT_FETCH_TTL_SECONDS
         assert config.cleanup_days == 7
         assert config.mcp_port == DEFAULT_MCP_PORT
         assert config.cors_origins == [DEFAULT_CORS_ORIGINS]
@@ -36,6 +41,7 @@ def test_config_from_environment():
         "LUCIDITY_CACHE_DIR": "/custom/cache/dir",
         "LUCIDITY_CLONE_TIMEOUT": "600",
         "LUCIDITY_FETCH_TIMEOUT": "120",
+        "LUCIDITY_FETCH_TTL": "0",
         "LUCIDITY_CLEANUP_DAYS": "14",
         "LUCIDITY_MCP_PORT": "8080",
         "LUCIDITY_CORS_ORIGINS": "http://localhost:3000,http://example.com",
@@ -48,6 +54,7 @@ def test_config_from_environment():
         assert config.cache_dir == "/custom/cache/dir"
         assert config.clone_timeout == 600
         assert config.fetch_timeout == 120
+        assert config.fetch_ttl == 0
         assert config.cleanup_days == 14
         assert config.mcp_port == 8080
         assert config.cors_origins == ["http://localhost:3000", "http://example.com"]
@@ -84,6 +91,24 @@ def test_ssh_verify_variations():
             assert config.ssh_verify is False, f"Failed for value: {false_value}"
 
 
+def test_invalid_integer_value():
+    """Test that invalid integer values raise a ValueError naming the variable."""
+    with (
+        patch.dict(os.environ, {"LUCIDITY_CLONE_TIMEOUT": "soon"}, clear=True),
+        pytest.raises(ValueError, match="LUCIDITY_CLONE_TIMEOUT: soon"),
+    ):
+        Config.from_environment()
+
+
+def test_config_is_immutable():
+    """Test that configuration instances cannot be modified after creation."""
+    with patch.dict(os.environ, {}, clear=True):
+        config = Config.from_environment()
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.mcp_port = 1234  # type: ignore[misc]
+
+
 def test_get_config_singleton():
     """Test that get_config returns a singleton instance."""
     # Clear any existing config but restore it afterwards to avoid cross-test contamination.
